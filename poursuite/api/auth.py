@@ -1,9 +1,10 @@
 from fastapi import HTTPException, Security, status
-from fastapi.security import APIKeyHeader
+from fastapi.security import APIKeyHeader, APIKeyQuery
 
 from poursuite.config import API_KEY
 
 _api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+_api_key_query = APIKeyQuery(name="key", auto_error=False)
 
 
 def require_api_key(key: str = Security(_api_key_header)) -> str:
@@ -12,6 +13,18 @@ def require_api_key(key: str = Security(_api_key_header)) -> str:
     Raises 500 if the server has no API key configured (forces operator to set env var).
     Raises 403 if the key is missing or wrong.
     """
+    return _check_api_key(key)
+
+
+def require_api_key_query(key: str = Security(_api_key_query)) -> str:
+    """
+    Same check as require_api_key, but reads the key from the ?key= query parameter.
+    Only for endpoints consumed by EventSource, which cannot send custom headers.
+    """
+    return _check_api_key(key)
+
+
+def _check_api_key(key: str) -> str:
     if not API_KEY:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
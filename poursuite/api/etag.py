@@ -0,0 +1,40 @@
+"""
+Weak ETag helpers for conditional GETs.
+
+A route computes an ETag from whatever determines its body, checks it against
+the client's If-None-Match and answers 304 with no body when they match.
+"""
+
+from hashlib import blake2b
+
+import orjson
+from fastapi import Request, Response
+
+from poursuite.config import HTTP_CACHE_MAX_AGE_SECONDS
+
+CACHE_CONTROL = f"private, max-age={HTTP_CACHE_MAX_AGE_SECONDS}"
+
+
+def weak_etag(*parts) -> str:
+    """Weak ETag over any orjson-serializable values."""
+    digest = blake2b(orjson.dumps(parts), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists etag (weak comparison, as RFC 9110 requires for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def cache_headers(etag: str, cache_control: str = CACHE_CONTROL) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
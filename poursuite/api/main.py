@@ -11,15 +11,18 @@ intra-process parallelism already.
 Cloudflare Tunnel handles TLS termination — no nginx or certificate management needed.
 """
 
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from poursuite.db.connection import DatabaseManager
 from poursuite.db.search import SearchEngine
 from poursuite.api.routes import extract as extract_router
-from poursuite.api.routes import frontend as frontend_router
+from poursuite.api.routes.frontend import install_frontend
 from poursuite.api.routes import search as search_router
+from poursuite.api.routes import stats as stats_router
 
 
 @asynccontextmanager
@@ -27,8 +30,11 @@ async def lifespan(app: FastAPI):
     # Startup: discover databases once, hold connections for the session
     app.state.db_manager = DatabaseManager()
     app.state.search_engine = SearchEngine(app.state.db_manager)
+    # Open every database in the background so the first search finds them ready
+    threading.Thread(target=app.state.db_manager.warm_connections, daemon=True).start()
     yield
-    # Shutdown: close all open SQLite connections cleanly
+    # Shutdown: stop the search threads, then close all open SQLite connections cleanly
+    app.state.search_engine.close()
     app.state.db_manager.close_connections()
 
 
@@ -43,6 +49,11 @@ app = FastAPI(
     openapi_url=None,
 )
 
-app.include_router(frontend_router.router)
+# Search JSON and CSV exports compress well. Responses that already carry a
+# Content-Encoding and the /extract/events stream (text/event-stream) pass through.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+install_frontend(app)
 app.include_router(search_router.router)
 app.include_router(extract_router.router)
+app.include_router(stats_router.router)
@@ -2,21 +2,26 @@
 eSAJ extraction API.
 
 Jobs run in background daemon threads. Results accumulate in an in-memory
-store polled by the frontend every 2 seconds. The store is never persisted —
+store that the frontend follows through a Server-Sent Events stream (or, as
+a fallback, by polling every 2 seconds). The store is never persisted —
 a server restart clears all jobs (acceptable for a local single-user setup).
 """
 
+import asyncio
 import csv
 import io
+import json
+import re
 import threading
 import uuid
-from typing import Dict, List, Optional
+from dataclasses import fields
+from typing import AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from poursuite.api.auth import require_api_key
+from poursuite.api.auth import require_api_key, require_api_key_query
 from poursuite.config import DEFAULT_MAX_BROWSERS
 from poursuite.models import ProcessData
 from poursuite.scraper.esaj import ProcessValueScraper
@@ -28,6 +33,12 @@ router = APIRouter(prefix="/extract", tags=["extract"])
 _jobs: Dict[str, dict] = {}
 _jobs_lock = threading.Lock()
 
+# How often an open event stream checks the job store for new results
+_EVENT_INTERVAL_SECONDS = 0.5
+
+_SORTABLE_COLUMNS = frozenset(f.name for f in fields(ProcessData))
+_NON_DIGITS = re.compile(r'[^\d,]')
+
 
 # ── Request schema ────────────────────────────────────────────────────
 
@@ -99,9 +110,14 @@ def start_extraction(
 @router.get("/status/{job_id}")
 def get_status(
     job_id: str,
+    since: int = Query(default=0, ge=0),
     _key: str = Depends(require_api_key),
 ):
-    """Poll extraction job status and accumulated results so far."""
+    """
+    Poll extraction job status and accumulated results so far.
+    With ?since=N only results after the first N are returned, so a poller that
+    already holds N rows receives just the new ones.
+    """
     with _jobs_lock:
         if job_id not in _jobs:
             raise HTTPException(status_code=404, detail="Job not found.")
@@ -111,12 +127,133 @@ def get_status(
             "status": job["status"],
             "total": job["total"],
             "done": job["done"],
-            "results": list(job["results"]),
+            "results": job["results"][since:],
             "error": job["error"],
         }
     return snapshot
 
 
+def _sort_key(column: str, value):
+    """
+    Sort key for one result cell, matching the frontend's parseSortValue.
+    Returns None for empty cells so the caller can keep them last.
+    """
+    if value is None or value == "":
+        return None
+    if column == "other_processes":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+    if column == "value":
+        # "R$ 1.234,56" -> 1234.56
+        try:
+            return float(_NON_DIGITS.sub("", str(value)).replace(",", ".", 1))
+        except ValueError:
+            return None
+    return str(value).lower()
+
+
+@router.get("/results/{job_id}")
+def get_results(
+    job_id: str,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=100, ge=1, le=1000),
+    sort_col: Optional[str] = Query(default=None),
+    sort_dir: str = Query(default="asc", pattern="^(asc|desc)$"),
+    _key: str = Depends(require_api_key),
+):
+    """
+    One page of a job's results, optionally sorted by a column.
+    Empty cells sort last in both directions, as in the frontend table.
+    """
+    if sort_col is not None and sort_col not in _SORTABLE_COLUMNS:
+        raise HTTPException(status_code=422, detail=f"Cannot sort by {sort_col!r}.")
+
+    with _jobs_lock:
+        if job_id not in _jobs:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        results = list(_jobs[job_id]["results"])
+
+    if sort_col:
+        keyed = [(_sort_key(sort_col, row.get(sort_col)), row) for row in results]
+        present = [item for item in keyed if item[0] is not None]
+        present.sort(key=lambda item: item[0], reverse=(sort_dir == "desc"))
+        results = [row for _, row in present] + [row for k, row in keyed if k is None]
+
+    offset = (page - 1) * page_size
+    return {
+        "total": len(results),
+        "page": page,
+        "page_size": page_size,
+        "results": results[offset: offset + page_size],
+    }
+
+
+def _sse(event: str, data, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_events(job_id: str, request: Request, sent: int) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a job until it finishes or the client disconnects.
+
+    Each "rows" message carries the results appended since the previous one and
+    uses the running result count as its id, so a reconnecting EventSource
+    resumes from Last-Event-ID instead of receiving duplicates.
+    """
+    last_done = None
+    while True:
+        with _jobs_lock:
+            job = _jobs.get(job_id)
+            if job is None:
+                return
+            new_rows = job["results"][sent:]
+            status, done, total, error = job["status"], job["done"], job["total"], job["error"]
+
+        if new_rows:
+            sent += len(new_rows)
+            yield _sse("rows", new_rows, event_id=sent)
+        if done != last_done:
+            last_done = done
+            yield _sse("progress", {"done": done, "total": total})
+        if status == "done":
+            yield _sse("done", {"done": done, "total": total})
+            return
+        if status == "error":
+            # Not "error": that name is reserved for EventSource connection errors
+            yield _sse("failed", {"error": error})
+            return
+
+        if await request.is_disconnected():
+            return
+        await asyncio.sleep(_EVENT_INTERVAL_SECONDS)
+
+
+@router.get("/events/{job_id}")
+def stream_events(
+    job_id: str,
+    request: Request,
+    _key: str = Depends(require_api_key_query),
+):
+    """Stream job progress and new results as Server-Sent Events (key via ?key=)."""
+    with _jobs_lock:
+        if job_id not in _jobs:
+            raise HTTPException(status_code=404, detail="Job not found.")
+
+    try:
+        sent = max(0, int(request.headers.get("last-event-id", "0")))
+    except ValueError:
+        sent = 0
+
+    return StreamingResponse(
+        _job_events(job_id, request, sent),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/export/{job_id}")
 def export_csv(
     job_id: str,
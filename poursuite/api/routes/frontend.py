@@ -1,464 +1,1605 @@
-"""Serve the single-page HTML frontend (Search + Extract tabs)."""
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse
+"""
+Serve the single-page HTML frontend (Search + Extract tabs).
+
+The stylesheet and script are served as separate content-hashed assets so
+browsers can cache them indefinitely and start fetching them from the
+preload hints at the top of the page.
+
+Everything here is static, so the responses are built once at import time and
+served from plain Starlette routes (see install_frontend) rather than through
+FastAPI's dependency and response-model machinery.
+"""
+import hashlib
+
+from fastapi import FastAPI
+from starlette.responses import HTMLResponse, Response
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+_CSS = """*, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
+
+body {
+  font-family: system-ui, -apple-system, "Segoe UI", sans-serif;
+  background: #0d0f1a;
+  color: #dde1f0;
+  min-height: 100vh;
+}
+
+/* ── Header ── */
+header {
+  background: #13162a;
+  border-bottom: 1px solid #252947;
+  padding: 12px 24px;
+  display: flex;
+  align-items: center;
+  gap: 20px;
+  position: sticky;
+  top: 0;
+  z-index: 10;
+}
+header h1 {
+  font-size: 1.1rem;
+  font-weight: 700;
+  color: #7b8fff;
+  letter-spacing: 0.06em;
+  white-space: nowrap;
+}
+.api-key-row {
+  display: flex;
+  align-items: center;
+  gap: 8px;
+  margin-left: auto;
+}
+.api-key-row label {
+  font-size: 0.8rem;
+  color: #6b7280;
+  white-space: nowrap;
+}
+#apiKeyInput {
+  background: #1c1f35;
+  border: 1px solid #2e3255;
+  border-radius: 6px;
+  padding: 6px 10px;
+  color: #dde1f0;
+  font-size: 0.82rem;
+  width: 200px;
+  outline: none;
+  transition: border-color 0.2s;
+}
+#apiKeyInput:focus { border-color: #7b8fff; }
+
+/* ── Tab bar ── */
+.tab-bar {
+  display: flex;
+  gap: 4px;
+}
+.tab-btn {
+  background: none;
+  border: none;
+  border-radius: 6px;
+  padding: 7px 16px;
+  font-size: 0.84rem;
+  font-weight: 600;
+  color: #5a607a;
+  cursor: pointer;
+  transition: background 0.15s, color 0.15s;
+}
+.tab-btn:hover { background: #1c1f35; color: #dde1f0; }
+.tab-btn.active { background: #1c1f35; color: #7b8fff; }
+
+/* ── Layout ── */
+.container {
+  max-width: 1100px;
+  margin: 0 auto;
+  padding: 28px 20px;
+}
+.tab-content.hidden { display: none !important; }
+
+/* ── Search card ── */
+.search-card {
+  background: #13162a;
+  border: 1px solid #252947;
+  border-radius: 12px;
+  padding: 22px 24px 20px;
+  margin-bottom: 20px;
+}
+.search-card h2 {
+  font-size: 0.72rem;
+  font-weight: 600;
+  color: #5a607a;
+  text-transform: uppercase;
+  letter-spacing: 0.1em;
+  margin-bottom: 16px;
+}
+
+.form-grid {
+  display: grid;
+  grid-template-columns: 1fr 1fr;
+  gap: 14px;
+}
+.form-group { display: flex; flex-direction: column; gap: 5px; }
+.form-group.span2 { grid-column: 1 / -1; }
+
+label {
+  font-size: 0.78rem;
+  font-weight: 500;
+  color: #7b8499;
+}
+input[type="text"], input[type="date"], select, textarea {
+  background: #0d0f1a;
+  border: 1px solid #252947;
+  border-radius: 7px;
+  padding: 9px 13px;
+  color: #dde1f0;
+  font-size: 0.875rem;
+  outline: none;
+  transition: border-color 0.2s;
+  width: 100%;
+  font-family: inherit;
+}
+input[type="text"]:focus,
+input[type="date"]:focus,
+select:focus,
+textarea:focus { border-color: #7b8fff; background: #101328; }
+input::placeholder, textarea::placeholder { color: #3d4260; }
+textarea { resize: vertical; line-height: 1.5; }
+
+/* ── Checkbox label ── */
+.checkbox-label {
+  display: flex;
+  align-items: center;
+  gap: 8px;
+  font-size: 0.83rem;
+  font-weight: 500;
+  color: #7b8499;
+  cursor: pointer;
+}
+.checkbox-label input[type="checkbox"] {
+  width: 15px;
+  height: 15px;
+  accent-color: #4a58e8;
+  cursor: pointer;
+}
+.hint {
+  font-size: 0.74rem;
+  color: #3d4260;
+  margin-top: 2px;
+}
+
+.form-actions {
+  display: flex;
+  gap: 10px;
+  margin-top: 18px;
+  align-items: center;
+  flex-wrap: wrap;
+}
+
+/* ── Buttons ── */
+.btn {
+  border: none;
+  border-radius: 7px;
+  padding: 9px 18px;
+  font-size: 0.85rem;
+  font-weight: 600;
+  cursor: pointer;
+  transition: background 0.18s, color 0.18s;
+  display: inline-flex;
+  align-items: center;
+  gap: 7px;
+  user-select: none;
+}
+.btn-primary { background: #4a58e8; color: #fff; }
+.btn-primary:hover:not(:disabled) { background: #6070f0; }
+.btn-primary:disabled { background: #1e2240; color: #404870; cursor: not-allowed; }
+
+.btn-csv { background: #0d6e40; color: #fff; }
+.btn-csv:hover:not(:disabled) { background: #0f8a52; }
+.btn-csv:disabled { background: #0d2a1e; color: #2a5040; cursor: not-allowed; }
+
+.btn-ghost {
+  background: #1c1f35;
+  color: #6b7280;
+  border: 1px solid #252947;
+}
+.btn-ghost:hover { background: #252947; color: #dde1f0; }
+
+.btn-extract {
+  background: #1c1f35;
+  color: #7b8fff;
+  border: 1px solid #2e3255;
+  font-size: 0.8rem;
+}
+.btn-extract:hover:not(:disabled) { background: #252947; }
+.btn-extract:disabled { opacity: 0.4; cursor: not-allowed; }
+
+/* ── Spinner ── */
+.spinner {
+  width: 14px; height: 14px;
+  border: 2px solid currentColor;
+  border-top-color: transparent;
+  border-radius: 50%;
+  display: inline-block;
+  animation: spin 0.7s linear infinite;
+  vertical-align: middle;
+}
+@keyframes spin { to { transform: rotate(360deg); } }
+
+/* ── Status bar ── */
+.status {
+  padding: 10px 14px;
+  border-radius: 8px;
+  font-size: 0.875rem;
+  margin-bottom: 16px;
+  display: flex;
+  align-items: center;
+  gap: 8px;
+}
+.status.info    { background: #0e2340; border: 1px solid #1e4880; color: #7eb8f5; }
+.status.warn    { background: #2a2010; border: 1px solid #6e4a10; color: #f0c060; }
+.status.error   { background: #2a1010; border: 1px solid #6e2020; color: #f08080; }
+.status.success { background: #0d2a1e; border: 1px solid #1e6040; color: #60d090; }
+.hidden { display: none !important; }
+
+/* ── Results header ── */
+.results-header {
+  display: flex;
+  align-items: baseline;
+  justify-content: space-between;
+  flex-wrap: wrap;
+  gap: 8px;
+  margin-bottom: 14px;
+}
+.results-header-left {
+  display: flex;
+  align-items: baseline;
+  gap: 14px;
+  flex-wrap: wrap;
+}
+.results-summary {
+  font-size: 0.875rem;
+  color: #6b7280;
+}
+.results-summary strong { color: #dde1f0; }
+
+/* ── Process list ── */
+.process-list { display: flex; flex-direction: column; gap: 6px; }
+.process-list.virtual { overflow-anchor: none; }
+
+.process-card {
+  background: #13162a;
+  border: 1px solid #252947;
+  border-radius: 9px;
+  overflow: hidden;
+  /* Skip style/layout/paint for off-screen cards; "auto" remembers the
+     last rendered size so the scrollbar stays stable. */
+  content-visibility: auto;
+  contain-intrinsic-size: auto 48px;
+  contain: layout paint;
+}
+/* Windowed lists measure card heights, which needs real layout */
+.process-list.virtual .process-card { content-visibility: visible; }
+
+.process-header {
+  display: flex;
+  align-items: center;
+  justify-content: space-between;
+  padding: 13px 16px;
+  cursor: pointer;
+  user-select: none;
+  transition: background 0.15s;
+}
+.process-header:hover { background: #181b30; }
+
+.process-num {
+  font-family: "Cascadia Code", "Fira Code", "Courier New", monospace;
+  font-size: 0.9rem;
+  font-weight: 600;
+  color: #7b8fff;
+}
+
+.process-right {
+  display: flex;
+  align-items: center;
+  gap: 10px;
+}
+
+.badge {
+  background: #1c1f35;
+  color: #6b7280;
+  font-size: 0.75rem;
+  padding: 3px 8px;
+  border-radius: 10px;
+  font-weight: 500;
+}
+
+.chevron {
+  color: #3d4260;
+  font-size: 0.8rem;
+  transition: transform 0.2s;
+}
+.process-card.open .chevron { transform: rotate(180deg); }
+
+/* ── Mentions ── */
+.mentions-wrap {
+  display: none;
+  border-top: 1px solid #1c1f35;
+}
+.process-card.open .mentions-wrap { display: block; }
+
+.mention-item {
+  padding: 13px 16px;
+  border-bottom: 1px solid #0d0f1a;
+  content-visibility: auto;
+  contain-intrinsic-size: auto 120px;
+}
+.mention-item:last-child { border-bottom: none; }
+
+.mention-meta {
+  display: flex;
+  flex-wrap: wrap;
+  gap: 14px;
+  margin-bottom: 7px;
+}
+.mention-meta span {
+  font-size: 0.78rem;
+  color: #4a5170;
+  display: flex;
+  align-items: center;
+  gap: 4px;
+}
+
+.mention-content {
+  font-size: 0.85rem;
+  color: #a0aabb;
+  line-height: 1.65;
+  white-space: pre-wrap;
+  word-break: break-word;
+}
+
+.expand-btn {
+  background: none;
+  border: none;
+  color: #5a6aee;
+  font-size: 0.78rem;
+  cursor: pointer;
+  padding: 4px 0 0;
+  display: block;
+}
+.expand-btn:hover { text-decoration: underline; }
+
+/* ── Pagination ── */
+.pagination {
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  gap: 6px;
+  margin-top: 20px;
+  flex-wrap: wrap;
+}
+.page-btn {
+  background: #13162a;
+  border: 1px solid #252947;
+  border-radius: 6px;
+  padding: 7px 13px;
+  color: #7b8499;
+  cursor: pointer;
+  font-size: 0.82rem;
+  transition: all 0.15s;
+}
+.page-btn:hover:not(:disabled) { background: #252947; color: #dde1f0; }
+.page-btn:disabled { opacity: 0.35; cursor: not-allowed; }
+.page-btn.active { background: #4a58e8; border-color: #4a58e8; color: #fff; }
+.page-info { color: #3d4260; font-size: 0.82rem; padding: 0 4px; }
+
+/* ── Empty state ── */
+.empty {
+  text-align: center;
+  padding: 48px 0;
+  color: #3d4260;
+  font-size: 0.9rem;
+}
+
+/* ── Progress bar ── */
+.progress-wrap {
+  margin-bottom: 16px;
+}
+.progress-track {
+  background: #1c1f35;
+  border-radius: 6px;
+  height: 8px;
+  overflow: hidden;
+  margin-bottom: 8px;
+}
+.progress-fill {
+  background: #4a58e8;
+  height: 100%;
+  width: 0%;
+  border-radius: 6px;
+  transition: width 0.4s ease;
+}
+.progress-text {
+  font-size: 0.82rem;
+  color: #5a607a;
+}
+
+/* ── Extract results table ── */
+.extract-table-wrap {
+  overflow: auto;
+  max-height: 70vh;
+  overflow-anchor: none;
+  border-radius: 9px;
+  border: 1px solid #252947;
+}
+.extract-table {
+  width: 100%;
+  border-collapse: collapse;
+  font-size: 0.81rem;
+  white-space: nowrap;
+}
+.extract-table th {
+  background: #1c1f35;
+  padding: 10px 14px;
+  text-align: left;
+  font-weight: 600;
+  color: #7b8499;
+  border-bottom: 1px solid #252947;
+  position: sticky;
+  top: 0;
+  cursor: pointer;
+  user-select: none;
+  white-space: nowrap;
+}
+.extract-table th:hover { color: #dde1f0; background: #22263d; }
+.extract-table th.sort-asc::after  { content: ' \\25b2'; font-size: 0.65rem; color: #7b8fff; }
+.extract-table th.sort-desc::after { content: ' \\25bc'; font-size: 0.65rem; color: #7b8fff; }
+.extract-table td {
+  padding: 9px 14px;
+  border-bottom: 1px solid #0d0f1a;
+  color: #a0aabb;
+  max-width: 220px;
+  overflow: hidden;
+  text-overflow: ellipsis;
+}
+.extract-table tr:last-child td { border-bottom: none; }
+.extract-table tr:hover td { background: #111428; }
+.extract-table td.col-number {
+  font-family: "Cascadia Code", "Fira Code", "Courier New", monospace;
+  color: #7b8fff;
+  font-size: 0.82rem;
+}
+.extract-table td.col-error { color: #f08080; }
+.extract-table tr.spacer td { padding: 0; border: none; }
+
+/* ── Responsive ── */
+@media (max-width: 600px) {
+  .form-grid { grid-template-columns: 1fr; }
+  .form-group.span2 { grid-column: 1; }
+  .tab-btn { padding: 7px 10px; font-size: 0.78rem; }
+}
+"""
+
+_JS = """// ── Config ──────────────────────────────────────────────────
+
+// ── Shared: API key ──────────────────────────────────────────
+const keyInput = document.getElementById('apiKeyInput');
+const stored = sessionStorage.getItem('poursuiteKey');
+if (stored) keyInput.value = stored;
+// Persist the key 250 ms after the last keystroke rather than on every one
+let keySaveTimer = null;
+function saveKey() {
+  clearTimeout(keySaveTimer);
+  keySaveTimer = null;
+  sessionStorage.setItem('poursuiteKey', keyInput.value.trim());
+}
+keyInput.addEventListener('input', () => {
+  clearTimeout(keySaveTimer);
+  keySaveTimer = setTimeout(saveKey, 250);
+});
+window.addEventListener('beforeunload', () => {
+  if (keySaveTimer !== null) saveKey();
+});
+function apiKey() { return keyInput.value.trim(); }
+
+// ── Tab switching ────────────────────────────────────────────
+function switchTab(name) {
+  document.querySelectorAll('.tab-btn').forEach(b => {
+    b.classList.toggle('active', b.dataset.tab === name);
+  });
+  document.querySelectorAll('.tab-content').forEach(c => {
+    c.classList.toggle('hidden', c.id !== 'tab-' + name);
+  });
+}
+document.querySelectorAll('.tab-btn').forEach(btn => {
+  btn.addEventListener('click', () => switchTab(btn.dataset.tab));
+});
+
+// ── Cached element lookups ───────────────────────────────────
+const $ = Object.freeze({
+  // Search tab
+  searchForm:      document.getElementById('searchForm'),
+  fPageSize:       document.getElementById('fPageSize'),
+  searchBtn:       document.getElementById('searchBtn'),
+  csvBtn:          document.getElementById('csvBtn'),
+  clearBtn:        document.getElementById('clearBtn'),
+  statusBar:       document.getElementById('statusBar'),
+  resultsSection:  document.getElementById('resultsSection'),
+  resultsSummary:  document.getElementById('resultsSummary'),
+  sendExtractBtn:  document.getElementById('sendExtractBtn'),
+  processList:     document.getElementById('processList'),
+  pagination:      document.getElementById('pagination'),
+  // Extract tab
+  eStatusBar:      document.getElementById('eStatusBar'),
+  eProgressFill:   document.getElementById('eProgressFill'),
+  eProgressText:   document.getElementById('eProgressText'),
+  eResultsSummary: document.getElementById('eResultsSummary'),
+  eNumbers:        document.getElementById('eNumbers'),
+  eConcurrent:     document.getElementById('eConcurrent'),
+  eIncludeOther:   document.getElementById('eIncludeOther'),
+  eStartBtn:       document.getElementById('eStartBtn'),
+  eClearBtn:       document.getElementById('eClearBtn'),
+  eProgressWrap:   document.getElementById('eProgressWrap'),
+  eResultsSection: document.getElementById('eResultsSection'),
+  eTableWrap:      document.getElementById('eTableWrap'),
+  eExportBtn:      document.getElementById('eExportBtn'),
+  tplRow:          document.getElementById('tplRow'),
+});
+
+// ════════════════════════════════════════════════════════════
+//  SEARCH TAB
+// ════════════════════════════════════════════════════════════
+
+let currentPage = 1;
+let searchAbort = null;    // AbortController of the in-flight search
+let lastSearchNumbers = [];
+let lastResults = [];
+let openCards   = new Set();   // indices into lastResults
+let expandedMentions = new Set();   // 'pi:mi' keys
+
+function buildParams(page) {
+  const form = $.searchForm;
+  const p = new URLSearchParams();
+  const names = ['keywords', 'process_number', 'start_date', 'end_date',
+                 'exclusion_terms', 'page_size'];
+  for (const n of names) {
+    const el = form.elements[n];
+    if (el && el.value.trim()) p.set(n, el.value.trim());
+  }
+  p.set('page', String(page));
+  return p;
+}
+
+function setStatus(type, msg) {
+  $.statusBar.className = 'status ' + type;
+  $.statusBar.innerHTML = msg;
+}
+function clearStatus() {
+  $.statusBar.classList.add('hidden');
+}
+
+// Abort the in-flight search, if any, and release the Search button
+function cancelSearch() {
+  if (!searchAbort) return;
+  searchAbort.abort();
+  searchAbort = null;
+  $.searchBtn.disabled = false;
+  $.searchBtn.textContent = 'Search';
+}
+
+async function doSearch(page) {
+  const key = apiKey();
+  if (!key) { setStatus('error', 'Please enter your API key.'); return; }
+
+  const params = buildParams(page);
+  if (!params.has('keywords') && !params.has('process_number')) {
+    setStatus('error', 'Enter keywords or a process number to search.');
+    return;
+  }
 
-router = APIRouter(include_in_schema=False)
+  // A newer search supersedes the pending one instead of waiting behind it
+  cancelSearch();
+  const ctrl = searchAbort = new AbortController();
+  currentPage = page;
+
+  const btn = $.searchBtn;
+  btn.disabled = true;
+  btn.innerHTML = '<span class="spinner"></span> Searching\u2026';
+  $.csvBtn.disabled = true;
+  clearStatus();
+
+  try {
+    const resp = await fetch('/search?' + params.toString(), {
+      headers: { 'X-API-Key': key },
+      signal: ctrl.signal,
+    });
 
-_HTML = """<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>Poursuite</title>
-  <style>
-    *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
-
-    body {
-      font-family: system-ui, -apple-system, "Segoe UI", sans-serif;
-      background: #0d0f1a;
-      color: #dde1f0;
-      min-height: 100vh;
+    if (!resp.ok) {
+      let detail = resp.statusText;
+      try { detail = (await resp.json()).detail || detail; } catch (_) {}
+      if (ctrl.signal.aborted) return;
+      setStatus('error', 'Error ' + resp.status + ': ' + detail);
+      $.resultsSection.classList.add('hidden');
+      return;
     }
 
-    /* ── Header ── */
-    header {
-      background: #13162a;
-      border-bottom: 1px solid #252947;
-      padding: 12px 24px;
-      display: flex;
-      align-items: center;
-      gap: 20px;
-      position: sticky;
-      top: 0;
-      z-index: 10;
-    }
-    header h1 {
-      font-size: 1.1rem;
-      font-weight: 700;
-      color: #7b8fff;
-      letter-spacing: 0.06em;
-      white-space: nowrap;
-    }
-    .api-key-row {
-      display: flex;
-      align-items: center;
-      gap: 8px;
-      margin-left: auto;
-    }
-    .api-key-row label {
-      font-size: 0.8rem;
-      color: #6b7280;
-      white-space: nowrap;
-    }
-    #apiKeyInput {
-      background: #1c1f35;
-      border: 1px solid #2e3255;
-      border-radius: 6px;
-      padding: 6px 10px;
-      color: #dde1f0;
-      font-size: 0.82rem;
-      width: 200px;
-      outline: none;
-      transition: border-color 0.2s;
-    }
-    #apiKeyInput:focus { border-color: #7b8fff; }
+    const data = await resp.json();
+    renderResults(data, page);
 
-    /* ── Tab bar ── */
-    .tab-bar {
-      display: flex;
-      gap: 4px;
-    }
-    .tab-btn {
-      background: none;
-      border: none;
-      border-radius: 6px;
-      padding: 7px 16px;
-      font-size: 0.84rem;
-      font-weight: 600;
-      color: #5a607a;
-      cursor: pointer;
-      transition: background 0.15s, color 0.15s;
-    }
-    .tab-btn:hover { background: #1c1f35; color: #dde1f0; }
-    .tab-btn.active { background: #1c1f35; color: #7b8fff; }
-
-    /* ── Layout ── */
-    .container {
-      max-width: 1100px;
-      margin: 0 auto;
-      padding: 28px 20px;
-    }
-    .tab-content.hidden { display: none !important; }
-
-    /* ── Search card ── */
-    .search-card {
-      background: #13162a;
-      border: 1px solid #252947;
-      border-radius: 12px;
-      padding: 22px 24px 20px;
-      margin-bottom: 20px;
-    }
-    .search-card h2 {
-      font-size: 0.72rem;
-      font-weight: 600;
-      color: #5a607a;
-      text-transform: uppercase;
-      letter-spacing: 0.1em;
-      margin-bottom: 16px;
+  } catch (err) {
+    if (err.name === 'AbortError') return;
+    setStatus('error', 'Network error: ' + err.message);
+  } finally {
+    if (searchAbort === ctrl) {
+      searchAbort = null;
+      btn.disabled = false;
+      btn.textContent = 'Search';
     }
+  }
+}
+
+function renderResults(data, page) {
+  const section  = $.resultsSection;
+  const list     = $.processList;
+  const summary  = $.resultsSummary;
+  const csvBtn   = $.csvBtn;
+  const sendBtn  = $.sendExtractBtn;
+
+  if (data.truncated) {
+    setStatus('warn',
+      '\u26a0\ufe0f Search timed out \u2014 results are partial. '
+      + 'Try a narrower query or a shorter date range.');
+  }
 
-    .form-grid {
-      display: grid;
-      grid-template-columns: 1fr 1fr;
-      gap: 14px;
-    }
-    .form-group { display: flex; flex-direction: column; gap: 5px; }
-    .form-group.span2 { grid-column: 1 / -1; }
+  const pageSize   = parseInt($.fPageSize.value, 10);
+  const totalPages = Math.max(1, Math.ceil(data.total_processes / pageSize));
 
-    label {
-      font-size: 0.78rem;
-      font-weight: 500;
-      color: #7b8499;
-    }
-    input[type="text"], input[type="date"], select, textarea {
-      background: #0d0f1a;
-      border: 1px solid #252947;
-      border-radius: 7px;
-      padding: 9px 13px;
-      color: #dde1f0;
-      font-size: 0.875rem;
-      outline: none;
-      transition: border-color 0.2s;
-      width: 100%;
-      font-family: inherit;
-    }
-    input[type="text"]:focus,
-    input[type="date"]:focus,
-    select:focus,
-    textarea:focus { border-color: #7b8fff; background: #101328; }
-    input::placeholder, textarea::placeholder { color: #3d4260; }
-    textarea { resize: vertical; line-height: 1.5; }
-
-    /* ── Checkbox label ── */
-    .checkbox-label {
-      display: flex;
-      align-items: center;
-      gap: 8px;
-      font-size: 0.83rem;
-      font-weight: 500;
-      color: #7b8499;
-      cursor: pointer;
-    }
-    .checkbox-label input[type="checkbox"] {
-      width: 15px;
-      height: 15px;
-      accent-color: #4a58e8;
-      cursor: pointer;
-    }
-    .hint {
-      font-size: 0.74rem;
-      color: #3d4260;
-      margin-top: 2px;
-    }
+  summary.innerHTML =
+    '<strong>' + data.total_processes.toLocaleString() + '</strong> processes found'
+    + ' \u2014 page ' + page + ' of ' + totalPages;
 
-    .form-actions {
-      display: flex;
-      gap: 10px;
-      margin-top: 18px;
-      align-items: center;
-      flex-wrap: wrap;
-    }
+  lastResults = data.results || [];
+  openCards = new Set();
+  expandedMentions = new Set();
+  vHeights = lastResults.length >= VIRTUAL_MIN
+    ? new Array(lastResults.length).fill(CARD_ESTIMATE) : null;
+  list.classList.toggle('virtual', vHeights !== null);
+  list.style.paddingTop = list.style.paddingBottom = '';
 
-    /* ── Buttons ── */
-    .btn {
-      border: none;
-      border-radius: 7px;
-      padding: 9px 18px;
-      font-size: 0.85rem;
-      font-weight: 600;
-      cursor: pointer;
-      transition: background 0.18s, color 0.18s;
-      display: inline-flex;
-      align-items: center;
-      gap: 7px;
-      user-select: none;
-    }
-    .btn-primary { background: #4a58e8; color: #fff; }
-    .btn-primary:hover:not(:disabled) { background: #6070f0; }
-    .btn-primary:disabled { background: #1e2240; color: #404870; cursor: not-allowed; }
-
-    .btn-csv { background: #0d6e40; color: #fff; }
-    .btn-csv:hover:not(:disabled) { background: #0f8a52; }
-    .btn-csv:disabled { background: #0d2a1e; color: #2a5040; cursor: not-allowed; }
-
-    .btn-ghost {
-      background: #1c1f35;
-      color: #6b7280;
-      border: 1px solid #252947;
-    }
-    .btn-ghost:hover { background: #252947; color: #dde1f0; }
+  if (lastResults.length === 0) {
+    list.innerHTML = '<div class="empty">No results found.</div>';
+    csvBtn.disabled = true;
+    sendBtn.classList.add('hidden');
+    sendBtn.disabled = true;
+    section.classList.remove('hidden');
+    renderPagination(page, totalPages);
+    return;
+  }
 
-    .btn-extract {
-      background: #1c1f35;
-      color: #7b8fff;
-      border: 1px solid #2e3255;
-      font-size: 0.8rem;
-    }
-    .btn-extract:hover:not(:disabled) { background: #252947; }
-    .btn-extract:disabled { opacity: 0.4; cursor: not-allowed; }
-
-    /* ── Spinner ── */
-    .spinner {
-      width: 14px; height: 14px;
-      border: 2px solid currentColor;
-      border-top-color: transparent;
-      border-radius: 50%;
-      display: inline-block;
-      animation: spin 0.7s linear infinite;
-      vertical-align: middle;
-    }
-    @keyframes spin { to { transform: rotate(360deg); } }
-
-    /* ── Status bar ── */
-    .status {
-      padding: 10px 14px;
-      border-radius: 8px;
-      font-size: 0.875rem;
-      margin-bottom: 16px;
-      display: flex;
-      align-items: center;
-      gap: 8px;
-    }
-    .status.info    { background: #0e2340; border: 1px solid #1e4880; color: #7eb8f5; }
-    .status.warn    { background: #2a2010; border: 1px solid #6e4a10; color: #f0c060; }
-    .status.error   { background: #2a1010; border: 1px solid #6e2020; color: #f08080; }
-    .status.success { background: #0d2a1e; border: 1px solid #1e6040; color: #60d090; }
-    .hidden { display: none !important; }
-
-    /* ── Results header ── */
-    .results-header {
-      display: flex;
-      align-items: baseline;
-      justify-content: space-between;
-      flex-wrap: wrap;
-      gap: 8px;
-      margin-bottom: 14px;
-    }
-    .results-header-left {
-      display: flex;
-      align-items: baseline;
-      gap: 14px;
-      flex-wrap: wrap;
-    }
-    .results-summary {
-      font-size: 0.875rem;
-      color: #6b7280;
+  if (vHeights) {
+    vStart = vEnd = 0;
+    section.classList.remove('hidden');
+    renderWindow(true);
+  } else {
+    // Build the whole page as one string and hand it to the HTML parser once
+    const parts = [];
+    for (let pi = 0; pi < lastResults.length; pi++) {
+      appendProcessCard(parts, lastResults[pi], pi);
+    }
+    list.innerHTML = parts.join('');
+  }
+
+  // Store process numbers for "Send to Extract"
+  lastSearchNumbers = lastResults.map(r => r.process_number);
+  sendBtn.textContent = 'Send ' + lastSearchNumbers.length + ' to Extract \u2192';
+  sendBtn.classList.remove('hidden');
+  sendBtn.disabled = false;
+
+  csvBtn.disabled = false;
+  section.classList.remove('hidden');
+  renderPagination(page, totalPages);
+}
+
+// Escape a value for interpolation into HTML text or a quoted attribute
+const ESC_MAP = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+function esc(s) {
+  return String(s).replace(/[&<>"']/g, c => ESC_MAP[c]);
+}
+
+// The API sends a preview of each mention; content_full_url is set when it was cut short
+function mentionPreview(m) {
+  return m.content_full_url ? m.content_preview + '\u2026' : m.content_preview;
+}
+
+async function loadFullContent(m) {
+  if (m.content_full === undefined) {
+    const resp = await fetch(m.content_full_url, { headers: { 'X-API-Key': apiKey() } });
+    if (!resp.ok) throw new Error('Error ' + resp.status + ' loading mention');
+    m.content_full = await resp.text();
+  }
+  return m.content_full;
+}
+
+// Card and mention markup. data-p / data-m index into lastResults so the
+// delegated click handler below can find the full mention content.
+function appendProcessCard(parts, proc, pi) {
+  const n = proc.mention_count;
+  parts.push(
+    '<div class="process-card', (openCards.has(pi) ? ' open' : ''), '" data-p="', pi, '">',
+    '<div class="process-header">',
+    '<span class="process-num">', esc(proc.process_number), '</span>',
+    '<div class="process-right">',
+    '<span class="badge">', n, ' mention', (n !== 1 ? 's' : ''), '</span>',
+    '<span class="chevron">\u25bc</span>',
+    '</div></div>',
+    '<div class="mentions-wrap">');
+  for (let mi = 0; mi < proc.mentions.length; mi++) {
+    appendMentionItem(parts, proc.mentions[mi], pi, mi);
+  }
+  parts.push('</div></div>');
+}
+
+function appendMentionItem(parts, m, pi, mi) {
+  const expanded = m.content_full !== undefined && expandedMentions.has(pi + ':' + mi);
+  parts.push(
+    '<div class="mention-item', (expanded ? ' expanded' : ''), '" data-m="', mi, '">',
+    '<div class="mention-meta">');
+  if (m.document_date) parts.push('<span>📅 ', esc(m.document_date), '</span>');
+  if (m.db_id)         parts.push('<span>🗄 ', esc(m.db_id), '</span>');
+  if (m.file_path)     parts.push('<span>📄 ', esc(m.file_path), '</span>');
+  parts.push('</div>');
+
+  parts.push('<div class="mention-content">',
+             esc(expanded ? m.content_full : mentionPreview(m)), '</div>');
+  if (m.content_full_url) {
+    parts.push('<button type="button" class="expand-btn">',
+               (expanded ? 'Show less' : 'Show more'), '</button>');
+  }
+  parts.push('</div>');
+}
+
+// One listener for every card header and "Show more" button in the list
+// Full text is fetched on first expand and kept on the mention for re-renders
+async function expandMention(item, btn, m, key) {
+  btn.disabled = true;
+  try {
+    const full = await loadFullContent(m);
+    expandedMentions.add(key);
+    if (!item.isConnected) return;   // windowed out meanwhile; next render expands it
+    item.classList.add('expanded');
+    item.querySelector('.mention-content').textContent = full;
+    btn.textContent = 'Show less';
+    if (vHeights) measureWindow($.processList);
+  } catch (err) {
+    setStatus('error', err.message);
+  } finally {
+    btn.disabled = false;
+  }
+}
+
+$.processList.addEventListener('click', e => {
+  const btn = e.target.closest('.expand-btn');
+  if (btn) {
+    const item = btn.closest('.mention-item');
+    const card = btn.closest('.process-card');
+    const m    = lastResults[card.dataset.p].mentions[item.dataset.m];
+    const key  = card.dataset.p + ':' + item.dataset.m;
+    if (item.classList.contains('expanded')) {
+      item.classList.remove('expanded');
+      expandedMentions.delete(key);
+      item.querySelector('.mention-content').textContent = mentionPreview(m);
+      btn.textContent = 'Show more';
+    } else {
+      expandMention(item, btn, m, key);
+      return;
     }
-    .results-summary strong { color: #dde1f0; }
+  } else {
+    const header = e.target.closest('.process-header');
+    if (!header) return;
+    const card = header.parentNode;
+    const pi   = +card.dataset.p;
+    if (card.classList.toggle('open')) openCards.add(pi); else openCards.delete(pi);
+  }
+  if (vHeights) measureWindow(e.currentTarget);
+});
+
+// ── Windowed rendering for large pages ───────────────────────
+// Pages with VIRTUAL_MIN+ processes keep only the cards around the viewport
+// in the DOM. The rest of the list is stood in for by padding sized from the
+// measured (or, until seen, estimated) height of each card.
+const VIRTUAL_MIN   = 250;
+const OVERSCAN      = 5;
+const CARD_GAP      = 6;    // .process-list gap
+const CARD_ESTIMATE = 48 + CARD_GAP;
+let vHeights = null;        // per-card heights incl. gap; null when not virtualized
+let vStart = 0, vEnd = 0;
+let vFramePending = false;
+
+function visibleRange(list) {
+  const n = vHeights.length;
+  const top    = Math.max(0, -list.getBoundingClientRect().top);
+  const bottom = top + window.innerHeight;
+  let i = 0, y = 0;
+  while (i < n && y + vHeights[i] <= top) y += vHeights[i++];
+  let j = i;
+  while (j < n && y < bottom) y += vHeights[j++];
+  return [Math.max(0, i - OVERSCAN), Math.min(n, j + OVERSCAN)];
+}
+
+function sumHeights(from, to) {
+  let total = 0;
+  for (let i = from; i < to; i++) total += vHeights[i];
+  return total;
+}
+
+function renderWindow(force) {
+  const list = $.processList;
+  const [start, end] = visibleRange(list);
+  if (!force && start === vStart && end === vEnd) return;
+  vStart = start;
+  vEnd   = end;
+  const parts = [];
+  for (let pi = start; pi < end; pi++) appendProcessCard(parts, lastResults[pi], pi);
+  list.innerHTML = parts.join('');
+  measureWindow(list);
+}
+
+function measureWindow(list) {
+  for (const card of list.children) {
+    vHeights[+card.dataset.p] = card.offsetHeight + CARD_GAP;
+  }
+  list.style.paddingTop    = sumHeights(0, vStart) + 'px';
+  list.style.paddingBottom = sumHeights(vEnd, vHeights.length) + 'px';
+}
+
+function scheduleWindow() {
+  if (!vHeights || vFramePending) return;
+  vFramePending = true;
+  requestAnimationFrame(() => {
+    vFramePending = false;
+    if (vHeights) renderWindow(false);
+  });
+}
+window.addEventListener('scroll', scheduleWindow, { passive: true });
+window.addEventListener('resize', scheduleWindow);
+
+function renderPagination(current, total) {
+  const pag = $.pagination;
+  pag.innerHTML = '';
+  if (total <= 1) return;
+
+  function pageBtn(label, page, active, disabled) {
+    const b = document.createElement('button');
+    b.className = 'page-btn' + (active ? ' active' : '');
+    b.textContent = label;
+    b.disabled = disabled;
+    if (!disabled) b.addEventListener('click', () => doSearch(page));
+    return b;
+  }
 
-    /* ── Process list ── */
-    .process-list { display: flex; flex-direction: column; gap: 6px; }
+  pag.appendChild(pageBtn('\u2190 Prev', current - 1, false, current <= 1));
 
-    .process-card {
-      background: #13162a;
-      border: 1px solid #252947;
-      border-radius: 9px;
-      overflow: hidden;
-    }
+  const start = Math.max(1, current - 2);
+  const end   = Math.min(total, start + 4);
+  for (let p = start; p <= end; p++) {
+    pag.appendChild(pageBtn(String(p), p, p === current, false));
+  }
 
-    .process-header {
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-      padding: 13px 16px;
-      cursor: pointer;
-      user-select: none;
-      transition: background 0.15s;
-    }
-    .process-header:hover { background: #181b30; }
+  const info = document.createElement('span');
+  info.className = 'page-info';
+  info.textContent = 'of ' + total;
+  pag.appendChild(info);
+
+  pag.appendChild(pageBtn('Next \u2192', current + 1, false, current >= total));
+}
+
+// ── CSV saving ───────────────────────────────────────────────
+const downloadAnchor = document.body.appendChild(
+  Object.assign(document.createElement('a'), { hidden: true }));
+
+// Save a CSV response to disk. Where the File System Access API exists the
+// picker opens first (it needs the click's user activation) and the body is
+// piped straight into the file; elsewhere the body is read chunk by chunk and
+// assembled into a Blob at the end. onProgress(bytes) is called per chunk.
+// Resolves to the response, or null if the user cancelled the picker.
+async function saveCsv(filename, fetchCsv, onProgress) {
+  let received = 0;
+  const counter = new TransformStream({
+    transform(chunk, ctrl) {
+      received += chunk.byteLength;
+      onProgress(received);
+      ctrl.enqueue(chunk);
+    },
+  });
 
-    .process-num {
-      font-family: "Cascadia Code", "Fira Code", "Courier New", monospace;
-      font-size: 0.9rem;
-      font-weight: 600;
-      color: #7b8fff;
-    }
+  if (!('showSaveFilePicker' in window)) {
+    const resp = await fetchCsv();
+    if (!resp.ok) return resp;
+    const reader = resp.body.pipeThrough(counter).getReader();
+    const chunks = [];
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      chunks.push(value);
+    }
+    const url = URL.createObjectURL(new Blob(chunks, { type: 'text/csv' }));
+    downloadAnchor.href     = url;
+    downloadAnchor.download = filename;
+    downloadAnchor.click();
+    // Released on the next task, once the browser has picked up the download
+    setTimeout(() => URL.revokeObjectURL(url), 0);
+    return resp;
+  }
 
-    .process-right {
-      display: flex;
-      align-items: center;
-      gap: 10px;
+  let handle;
+  try {
+    handle = await window.showSaveFilePicker({
+      suggestedName: filename,
+      types: [{ description: 'CSV file', accept: { 'text/csv': ['.csv'] } }],
+    });
+  } catch (err) {
+    if (err.name === 'AbortError') return null;
+    throw err;
+  }
+  const resp = await fetchCsv();
+  if (!resp.ok) return resp;
+  await resp.body.pipeThrough(counter).pipeTo(await handle.createWritable());
+  return resp;
+}
+
+function downloadProgress(btn) {
+  return bytes => {
+    btn.innerHTML = '<span class="spinner"></span> ' +
+      (bytes / 1048576).toFixed(1) + ' MB\u2026';
+  };
+}
+
+// ── CSV download (search) ────────────────────────────────────
+$.csvBtn.addEventListener('click', async () => {
+  const key = apiKey();
+  if (!key) { setStatus('error', 'API key required.'); return; }
+
+  const params = buildParams(currentPage);
+  const csvBtn = $.csvBtn;
+
+  csvBtn.disabled = true;
+  csvBtn.innerHTML = '<span class="spinner"></span> Preparing\u2026';
+  setStatus('info', '<span class="spinner"></span> Preparing CSV\u2026');
+
+  try {
+    const resp = await saveCsv('search_results.csv', () =>
+      fetch('/search/export?' + params.toString(), {
+        headers: { 'X-API-Key': key }
+      }), downloadProgress(csvBtn));
+    if (resp && !resp.ok) {
+      setStatus('error', 'Export error ' + resp.status + ': ' + resp.statusText);
+      return;
     }
+    clearStatus();
+  } catch (err) {
+    setStatus('error', 'Network error: ' + err.message);
+  } finally {
+    csvBtn.disabled = false;
+    csvBtn.textContent = 'Download CSV';
+  }
+});
+
+// ── Send to Extract ──────────────────────────────────────────
+$.sendExtractBtn.addEventListener('click', () => {
+  $.eNumbers.value = lastSearchNumbers.join('\\n');
+  switchTab('extract');
+});
+
+// ── Search form submit / clear ───────────────────────────────
+$.searchForm.addEventListener('submit', e => {
+  e.preventDefault();
+  doSearch(1);
+});
+
+$.clearBtn.addEventListener('click', () => {
+  cancelSearch();
+  $.searchForm.reset();
+  $.resultsSection.classList.add('hidden');
+  $.csvBtn.disabled = true;
+  $.sendExtractBtn.classList.add('hidden');
+  clearStatus();
+  currentPage = 1;
+  lastSearchNumbers = [];
+  lastResults = [];
+  vHeights = null;
+});
+
+// ════════════════════════════════════════════════════════════
+//  EXTRACT TAB
+// ════════════════════════════════════════════════════════════
+
+let extractJobId        = null;
+let extractPollTimer    = null;
+let extractPollDelay    = 0;
+let extractPollDone     = -1;
+let extractEvents       = null;
+let extractFramePending = false;
+let extractResultCount  = 0;
+let extractResults      = [];
+let extractSortCol      = null;
+let extractSortDir      = 'asc';
+
+function setExtractStatus(type, msg) {
+  $.eStatusBar.className = 'status ' + type;
+  $.eStatusBar.innerHTML = msg;
+}
+function clearExtractStatus() {
+  $.eStatusBar.classList.add('hidden');
+}
+
+// Single pass over the textarea: each non-empty line, trimmed, is one number
+function parseProcessNumbers() {
+  const s = $.eNumbers.value;
+  const out = [];
+  let start = 0;
+  while (start <= s.length) {
+    let end = s.indexOf('\\n', start);
+    if (end === -1) end = s.length;
+    const line = s.slice(start, end).trim();
+    if (line) out.push(line);
+    start = end + 1;
+  }
+  return out;
+}
+
+// Skips the DOM writes when neither count changed since the last call
+let progressDone  = -1;
+let progressTotal = -1;
+
+function setExtractProgress(done, total) {
+  if (done === progressDone && total === progressTotal) return;
+  progressDone  = done;
+  progressTotal = total;
+  const pct = total > 0 ? Math.round((done / total) * 100) : 0;
+  $.eProgressFill.style.width = pct + '%';
+  $.eProgressText.textContent =
+    'Processing ' + done + ' / ' + total + ' (' + pct + '%)';
+}
+
+async function startExtraction() {
+  const numbers = parseProcessNumbers();
+  if (!numbers.length) {
+    setExtractStatus('error', 'No process numbers entered.');
+    return;
+  }
+  const key = apiKey();
+  if (!key) {
+    setExtractStatus('error', 'Please enter your API key.');
+    return;
+  }
 
-    .badge {
-      background: #1c1f35;
-      color: #6b7280;
-      font-size: 0.75rem;
-      padding: 3px 8px;
-      border-radius: 10px;
-      font-weight: 500;
-    }
+  // Reset state
+  clearExtractStatus();
+  stopFollowing();
+  extractJobId       = null;
+  extractResultCount = 0;
+  extractResults     = [];
+  $.eProgressFill.style.width = '0%';
+  $.eProgressText.textContent = 'Starting\u2026';
+  progressDone = progressTotal = -1;
+  $.eProgressWrap.classList.remove('hidden');
+  $.eResultsSection.classList.remove('hidden');
+  $.eResultsSummary.textContent = '';
+  resetExtractTable();
+  $.eExportBtn.disabled = true;
+
+  const eStartBtn = $.eStartBtn;
+  eStartBtn.disabled = true;
+  eStartBtn.innerHTML = '<span class="spinner"></span> Starting\u2026';
+
+  try {
+    const resp = await fetch('/extract/start', {
+      method: 'POST',
+      headers: { 'X-API-Key': key, 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        process_numbers: numbers,
+        concurrent: parseInt($.eConcurrent.value),
+        include_other_processes: $.eIncludeOther.checked,
+      }),
+    });
 
-    .chevron {
-      color: #3d4260;
-      font-size: 0.8rem;
-      transition: transform 0.2s;
+    if (!resp.ok) {
+      const err = await resp.json().catch(() => ({}));
+      setExtractStatus('error', 'Failed to start: ' + (err.detail || resp.statusText));
+      eStartBtn.disabled = false;
+      eStartBtn.textContent = 'Start Extraction';
+      return;
     }
-    .process-card.open .chevron { transform: rotate(180deg); }
 
-    /* ── Mentions ── */
-    .mentions-wrap {
-      display: none;
-      border-top: 1px solid #1c1f35;
-    }
-    .process-card.open .mentions-wrap { display: block; }
+    const { job_id } = await resp.json();
+    extractJobId = job_id;
+    setExtractProgress(0, numbers.length);
+    followExtract(job_id, key);
 
-    .mention-item {
-      padding: 13px 16px;
-      border-bottom: 1px solid #0d0f1a;
-    }
-    .mention-item:last-child { border-bottom: none; }
+  } catch (err) {
+    setExtractStatus('error', 'Network error: ' + err.message);
+    eStartBtn.disabled = false;
+    eStartBtn.textContent = 'Start Extraction';
+  }
+}
+
+// Follow the job through its event stream; polling is the fallback for
+// browsers without EventSource or when the stream cannot be re-established.
+function followExtract(jobId, key) {
+  stopFollowing();
+  if (!window.EventSource) { startPolling(); return; }
+
+  const es = new EventSource('/extract/events/' + jobId + '?key=' + encodeURIComponent(key));
+  extractEvents = es;
+  es.addEventListener('rows', ev => appendExtractRows(JSON.parse(ev.data)));
+  es.addEventListener('progress', ev => {
+    const data = JSON.parse(ev.data);
+    setExtractProgress(data.done, data.total);
+  });
+  es.addEventListener('done', () => finishExtraction(extractResults));
+  es.addEventListener('failed', ev => failExtraction(JSON.parse(ev.data).error));
+  es.onerror = () => {
+    // While CONNECTING the browser reconnects on its own (resuming from
+    // Last-Event-ID); CLOSED means it gave up
+    if (es.readyState === EventSource.CLOSED && extractEvents === es) {
+      extractEvents = null;
+      startPolling();
+    }
+  };
+}
+
+// Polling backs off while the job makes no progress and speeds up while it does
+const POLL_MIN_MS   = 1000;
+const POLL_START_MS = 2000;
+const POLL_MAX_MS   = 10000;
+
+function startPolling() {
+  if (extractPollTimer) clearTimeout(extractPollTimer);
+  extractPollDelay = POLL_START_MS;
+  extractPollDone  = -1;
+  extractPollTimer = setTimeout(pollExtract, extractPollDelay);
+}
+
+function stopFollowing() {
+  if (extractEvents) { extractEvents.close(); extractEvents = null; }
+  if (extractPollTimer) { clearTimeout(extractPollTimer); extractPollTimer = null; }
+}
+
+async function pollExtract() {
+  const jobId = extractJobId;
+  if (!jobId) return;
+  let progressed = false;
+  try {
+    const resp = await fetch('/extract/status/' + jobId + '?since=' + extractResultCount, {
+      headers: { 'X-API-Key': apiKey() },
+    });
+    if (jobId !== extractJobId) return;   // cleared or restarted meanwhile
+    if (!resp.ok) throw new Error(resp.statusText);
 
-    .mention-meta {
-      display: flex;
-      flex-wrap: wrap;
-      gap: 14px;
-      margin-bottom: 7px;
-    }
-    .mention-meta span {
-      font-size: 0.78rem;
-      color: #4a5170;
-      display: flex;
-      align-items: center;
-      gap: 4px;
-    }
+    const data = await resp.json();
+    if (jobId !== extractJobId) return;
+    progressed = data.done !== extractPollDone;
+    extractPollDone = data.done;
+    setExtractProgress(data.done, data.total);
 
-    .mention-content {
-      font-size: 0.85rem;
-      color: #a0aabb;
-      line-height: 1.65;
-      white-space: pre-wrap;
-      word-break: break-word;
-    }
+    if (data.results.length) appendExtractRows(data.results);
 
-    .expand-btn {
-      background: none;
-      border: none;
-      color: #5a6aee;
-      font-size: 0.78rem;
-      cursor: pointer;
-      padding: 4px 0 0;
-      display: block;
-    }
-    .expand-btn:hover { text-decoration: underline; }
-
-    /* ── Pagination ── */
-    .pagination {
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      gap: 6px;
-      margin-top: 20px;
-      flex-wrap: wrap;
-    }
-    .page-btn {
-      background: #13162a;
-      border: 1px solid #252947;
-      border-radius: 6px;
-      padding: 7px 13px;
-      color: #7b8499;
-      cursor: pointer;
-      font-size: 0.82rem;
-      transition: all 0.15s;
-    }
-    .page-btn:hover:not(:disabled) { background: #252947; color: #dde1f0; }
-    .page-btn:disabled { opacity: 0.35; cursor: not-allowed; }
-    .page-btn.active { background: #4a58e8; border-color: #4a58e8; color: #fff; }
-    .page-info { color: #3d4260; font-size: 0.82rem; padding: 0 4px; }
-
-    /* ── Empty state ── */
-    .empty {
-      text-align: center;
-      padding: 48px 0;
-      color: #3d4260;
-      font-size: 0.9rem;
+    if (data.status === 'done') {
+      finishExtraction(extractResults);
+    } else if (data.status === 'error') {
+      failExtraction(data.error);
     }
+  } catch (_) {
+    // Network blip — retry on next tick
+  }
 
-    /* ── Progress bar ── */
-    .progress-wrap {
-      margin-bottom: 16px;
-    }
-    .progress-track {
-      background: #1c1f35;
-      border-radius: 6px;
-      height: 8px;
-      overflow: hidden;
-      margin-bottom: 8px;
-    }
-    .progress-fill {
-      background: #4a58e8;
-      height: 100%;
-      width: 0%;
-      border-radius: 6px;
-      transition: width 0.4s ease;
-    }
-    .progress-text {
-      font-size: 0.82rem;
-      color: #5a607a;
+  if (!extractPollTimer) return;   // finished, failed or cleared
+  extractPollDelay = progressed
+    ? Math.max(POLL_MIN_MS, extractPollDelay / 2)
+    : Math.min(POLL_MAX_MS, extractPollDelay * 2);
+  extractPollTimer = setTimeout(pollExtract, extractPollDelay);
+}
+
+function failExtraction(error) {
+  stopFollowing();
+  $.eStartBtn.disabled = false;
+  $.eStartBtn.textContent = 'Start Extraction';
+  setExtractStatus('error', 'Extraction error: ' + (error || 'Unknown error'));
+}
+
+function finishExtraction(results) {
+  stopFollowing();
+  invalidateSorted();
+
+  const eStartBtn = $.eStartBtn;
+  eStartBtn.disabled = false;
+  eStartBtn.textContent = 'Start Extraction';
+  $.eExportBtn.disabled = false;
+
+  let errors = 0;
+  for (let i = 0; i < results.length; i++) if (results[i].error) errors++;
+  const successful = results.length - errors;
+  $.eResultsSummary.innerHTML =
+    '<strong>' + results.length + '</strong> processed \u2014 ' +
+    '<strong>' + successful + '</strong> successful, ' +
+    '<strong>' + errors + '</strong> errors';
+  $.eProgressText.textContent =
+    'Done. ' + results.length + ' processes extracted.';
+  $.eProgressFill.style.width = '100%';
+}
+
+const EXTRACT_COLS = [
+  { key: 'number',          label: 'Process Number', cls: 'col-number' },
+  { key: 'initial_date',    label: 'Date' },
+  { key: 'class_type',      label: 'Class' },
+  { key: 'subject',         label: 'Subject' },
+  { key: 'value',           label: 'Value' },
+  { key: 'last_movement',   label: 'Last Movement' },
+  { key: 'status',          label: 'Status' },
+  { key: 'plaintiff',       label: 'Plaintiff' },
+  { key: 'defendant',       label: 'Defendant' },
+  { key: 'other_processes', label: 'Other Proc.' },
+  { key: 'error',           label: 'Error', cls: 'col-error' },
+];
+
+// Parse a value cell (e.g. "R$ 1.234,56") to a number for sorting, or Infinity for empty
+function parseSortValue(key, val) {
+  if (val === null || val === undefined || val === '') return Infinity;
+  if (key === 'other_processes') return Number(val) || 0;
+  if (key === 'value') {
+    // Strip currency symbols and convert BR decimal format to float
+    const n = parseFloat(String(val).replace(/[^\\d,]/g, '').replace(',', '.'));
+    return isNaN(n) ? Infinity : n;
+  }
+  return String(val).toLowerCase();
+}
+
+// Every column's sort key is parsed once, when the row arrives
+function attachSortKeys(row) {
+  const keys = {};
+  for (const col of EXTRACT_COLS) keys[col.key] = parseSortValue(col.key, row[col.key]);
+  row.__keys = keys;
+}
+
+// The sorted view is cached until the column, direction or row count changes,
+// so scrolling re-renders never re-sort.
+let sortedCache = null;
+let sortedKey   = '';
+
+function invalidateSorted() {
+  sortedCache = null;
+}
+
+function sortedResults() {
+  if (!extractSortCol) return extractResults;
+  const cacheKey = extractSortCol + '|' + extractSortDir + '|' + extractResults.length;
+  if (sortedCache && sortedKey === cacheKey) return sortedCache;
+
+  const col  = extractSortCol;
+  const dir  = extractSortDir === 'asc' ? 1 : -1;
+  const keys = extractResults.map(r => r.__keys[col]);
+  const order = keys.map((_, i) => i);
+  order.sort((a, b) => {
+    const va = keys[a];
+    const vb = keys[b];
+    // Nulls/empty always last
+    if (va === Infinity && vb === Infinity) return 0;
+    if (va === Infinity) return 1;
+    if (vb === Infinity) return -1;
+    return va < vb ? -dir : va > vb ? dir : 0;
+  });
+  sortedCache = order.map(i => extractResults[i]);
+  sortedKey   = cacheKey;
+  return sortedCache;
+}
+
+// New rows are appended to the results; unsorted rows landing below the
+// window only lengthen the bottom spacer and are drawn once scrolled to
+function appendExtractRows(rows) {
+  const prevLen = extractResults.length;
+  for (const row of rows) {
+    attachSortKeys(row);
+    extractResults.push(row);
+  }
+  extractResultCount = extractResults.length;
+  if (extractTable && !extractSortCol && extractWinEnd < prevLen) {
+    const rowH = extractRowH || ROW_ESTIMATE;
+    bottomSpacer.style.height = ((extractResults.length - extractWinEnd) * rowH) + 'px';
+    return;
+  }
+  invalidateSorted();
+  scheduleRerender();
+}
+
+// Sorting a large table is left to the server: the visible window is read
+// from GET /extract/results in SERVER_PAGE-row pages, cached until the sort
+// or the row count changes.
+const SERVER_SORT_MIN = 5000;
+const SERVER_PAGE     = 200;
+
+let serverPages = new Map();   // page number -> rows, or null while in flight
+let serverKey   = '';
+
+function serverSorted() {
+  return extractSortCol !== null && extractResults.length >= SERVER_SORT_MIN;
+}
+
+// Rows [start, end) of the server-sorted view, or null while any page is loading
+function serverWindow(start, end) {
+  const key = extractSortCol + '|' + extractSortDir + '|' + extractResults.length;
+  if (key !== serverKey) {
+    serverKey   = key;
+    serverPages = new Map();
+  }
+  const first = Math.floor(start / SERVER_PAGE) + 1;
+  const last  = Math.floor(Math.max(start, end - 1) / SERVER_PAGE) + 1;
+  let rows = [];
+  let ready = true;
+  for (let page = first; page <= last; page++) {
+    const pageRows = serverPages.get(page);
+    if (pageRows === undefined) fetchServerPage(page, key);
+    if (!pageRows) { ready = false; continue; }
+    rows = rows.concat(pageRows);
+  }
+  if (!ready) return null;
+  const offset = start - (first - 1) * SERVER_PAGE;
+  return rows.slice(offset, offset + (end - start));
+}
+
+async function fetchServerPage(page, key) {
+  serverPages.set(page, null);
+  const params = new URLSearchParams({
+    page, page_size: SERVER_PAGE, sort_col: extractSortCol, sort_dir: extractSortDir,
+  });
+  try {
+    const resp = await fetch('/extract/results/' + extractJobId + '?' + params.toString(), {
+      headers: { 'X-API-Key': apiKey() },
+    });
+    if (!resp.ok) throw new Error('Error ' + resp.status + ' loading sorted rows');
+    const data = await resp.json();
+    if (key !== serverKey) return;
+    serverPages.set(page, data.results);
+    scheduleRerender();
+  } catch (err) {
+    if (key === serverKey) serverPages.delete(page);
+    setExtractStatus('error', err.message);
+  }
+}
+
+// Batches, scroll events and sort clicks within one frame share a single render
+function scheduleRerender() {
+  if (extractFramePending) return;
+  extractFramePending = true;
+  requestAnimationFrame(() => {
+    extractFramePending = false;
+    if (extractJobId) renderExtractTable();
+  });
+}
+
+// The table is built once per job and windowed: only the rows in view of
+// #eTableWrap (plus EXTRACT_OVERSCAN each side) exist, cloned from #tplRow,
+// with spacer rows standing in for the rest. Rows that stay in the window keep
+// their <tr> (keyed by process number) and are only moved; nodes of rows that
+// left it are recycled for the rows coming in.
+const EXTRACT_OVERSCAN = 5;
+const ROW_ESTIMATE     = 34;   // px, until the first row is measured
+
+let extractTable = null;
+let windowNodes  = [];          // <tr> per row in the window, in order
+let rowNodes     = new Map();   // process number -> its <tr> in the window
+let extractRowH  = 0;
+let extractWinEnd = 0;   // index after the last row currently in the window
+let topSpacer    = null;
+let bottomSpacer = null;
+
+function resetExtractTable() {
+  invalidateSorted();
+  serverPages = new Map();
+  serverKey   = '';
+  extractTable = null;
+  windowNodes  = [];
+  rowNodes     = new Map();
+  $.eTableWrap.replaceChildren();
+}
+
+function spacerRow() {
+  const tr = document.createElement('tr');
+  tr.className = 'spacer';
+  const td = document.createElement('td');
+  td.colSpan = EXTRACT_COLS.length;
+  tr.appendChild(td);
+  return tr;
+}
+
+function buildExtractTable() {
+  const table = document.createElement('table');
+  table.className = 'extract-table';
+
+  const thead = document.createElement('thead');
+  const headerRow = document.createElement('tr');
+  for (const col of EXTRACT_COLS) {
+    const th = document.createElement('th');
+    th.textContent = col.label;
+    th.dataset.key = col.key;
+    if (extractSortCol === col.key) th.className = sortClass();
+    headerRow.appendChild(th);
+  }
+  thead.appendChild(headerRow);
+  thead.addEventListener('click', onSortClick);
+  table.appendChild(thead);
+
+  const tbody = document.createElement('tbody');
+  topSpacer    = tbody.appendChild(spacerRow());
+  bottomSpacer = tbody.appendChild(spacerRow());
+  table.appendChild(tbody);
+
+  $.eTableWrap.replaceChildren(table);
+  return table;
+}
+
+function sortClass() {
+  return extractSortDir === 'asc' ? 'sort-asc' : 'sort-desc';
+}
+
+// One listener for the whole header; only the old and new sorted <th> change
+function onSortClick(e) {
+  const th = e.target.closest('th');
+  if (!th) return;
+  const key = th.dataset.key;
+  if (extractSortCol === key) {
+    extractSortDir = extractSortDir === 'asc' ? 'desc' : 'asc';
+  } else {
+    if (extractSortCol) {
+      e.currentTarget.querySelector('th[data-key="' + extractSortCol + '"]').className = '';
+    }
+    extractSortCol = key;
+    extractSortDir = 'asc';
+  }
+  th.className = sortClass();
+  invalidateSorted();
+  scheduleRerender();
+}
+
+function renderExtractTable() {
+  if (!extractTable) extractTable = buildExtractTable();
+
+  // The window is sized for the whole viewport so it never comes up short
+  // while the wrapper is still growing towards its max-height. scrollTop is
+  // the only layout read before the writes below.
+  const total = extractResults.length;
+  const wrap  = extractTable.parentNode;
+  const rowH  = extractRowH || ROW_ESTIMATE;
+  const start = Math.max(0, Math.floor(wrap.scrollTop / rowH) - EXTRACT_OVERSCAN);
+  const end   = Math.min(total,
+    start + Math.ceil(window.innerHeight / rowH) + 2 * EXTRACT_OVERSCAN);
+
+  const rows = serverSorted() ? serverWindow(start, end) : sortedResults().slice(start, end);
+  if (!rows) return;   // keep showing the old rows until the server page arrives
+  const count = rows.length;
+  extractWinEnd = end;
+
+  topSpacer.style.height    = (start * rowH) + 'px';
+  bottomSpacer.style.height = ((total - start - count) * rowH) + 'px';
+
+  // Keep the nodes of rows still in view; a repeated number gets its own node
+  const nodes  = new Array(count);
+  const reused = new Set();
+  for (let i = 0; i < count; i++) {
+    const tr = rowNodes.get(rows[i].number);
+    if (tr && !reused.has(tr)) {
+      reused.add(tr);
+      nodes[i] = tr;
     }
+  }
+  // Nodes of rows that left are detached first, so they are refilled
+  // off-document and the kept nodes are already in relative order
+  const free = windowNodes.filter(tr => !reused.has(tr));
+  for (const tr of free) tr.remove();
+  for (let i = 0; i < count; i++) {
+    if (nodes[i]) continue;
+    nodes[i] = free.pop() || $.tplRow.content.firstElementChild.cloneNode(true);
+    fillExtractRow(nodes[i], rows[i]);
+  }
 
-    /* ── Extract results table ── */
-    .extract-table-wrap {
-      overflow-x: auto;
-      border-radius: 9px;
-      border: 1px solid #252947;
-    }
-    .extract-table {
-      width: 100%;
-      border-collapse: collapse;
-      font-size: 0.81rem;
-      white-space: nowrap;
-    }
-    .extract-table th {
-      background: #1c1f35;
-      padding: 10px 14px;
-      text-align: left;
-      font-weight: 600;
-      color: #7b8499;
-      border-bottom: 1px solid #252947;
-      position: sticky;
-      top: 0;
-      cursor: pointer;
-      user-select: none;
-      white-space: nowrap;
-    }
-    .extract-table th:hover { color: #dde1f0; background: #22263d; }
-    .extract-table th.sort-asc::after  { content: ' \25b2'; font-size: 0.65rem; color: #7b8fff; }
-    .extract-table th.sort-desc::after { content: ' \25bc'; font-size: 0.65rem; color: #7b8fff; }
-    .extract-table td {
-      padding: 9px 14px;
-      border-bottom: 1px solid #0d0f1a;
-      color: #a0aabb;
-      max-width: 220px;
-      overflow: hidden;
-      text-overflow: ellipsis;
-    }
-    .extract-table tr:last-child td { border-bottom: none; }
-    .extract-table tr:hover td { background: #111428; }
-    .extract-table td.col-number {
-      font-family: "Cascadia Code", "Fira Code", "Courier New", monospace;
-      color: #7b8fff;
-      font-size: 0.82rem;
-    }
-    .extract-table td.col-error { color: #f08080; }
+  windowNodes = nodes;
+  rowNodes    = new Map();
+  for (let i = count - 1; i >= 0; i--) rowNodes.set(rows[i].number, nodes[i]);
+
+  // Insert the incoming nodes; kept ones only move when a sort reordered them
+  let cursor = topSpacer.nextSibling;
+  for (const tr of nodes) {
+    if (tr === cursor) cursor = cursor.nextSibling;
+    else cursor.before(tr);
+  }
 
-    /* ── Responsive ── */
-    @media (max-width: 600px) {
-      .form-grid { grid-template-columns: 1fr; }
-      .form-group.span2 { grid-column: 1; }
-      .tab-btn { padding: 7px 10px; font-size: 0.78rem; }
+  if (!extractRowH && count) extractRowH = nodes[0].getBoundingClientRect().height;
+}
+
+function setCellText(td, val) {
+  const text = val == null ? '' : String(val);
+  if (td.textContent !== text) td.textContent = text;
+}
+
+// One formatter per column, chosen once, so filling a row has no per-cell
+// branching on the column; the error cell is only highlighted when set
+const COL_KEYS   = EXTRACT_COLS.map(col => col.key);
+const FORMATTERS = EXTRACT_COLS.map(col => col.key === 'error'
+  ? (td, val) => { setCellText(td, val); td.className = val ? 'col-error' : ''; }
+  : setCellText);
+
+function fillExtractRow(tr, row) {
+  const cells = tr.children;
+  for (let k = 0; k < FORMATTERS.length; k++) FORMATTERS[k](cells[k], row[COL_KEYS[k]]);
+}
+$.eTableWrap.addEventListener('scroll', scheduleRerender, { passive: true });
+window.addEventListener('resize', scheduleRerender);
+
+// ── Extract CSV download ─────────────────────────────────────
+$.eExportBtn.addEventListener('click', async () => {
+  if (!extractJobId) return;
+  const key = apiKey();
+  if (!key) return;
+
+  const eExportBtn = $.eExportBtn;
+  eExportBtn.disabled = true;
+  eExportBtn.innerHTML = '<span class="spinner"></span> Preparing\u2026';
+
+  try {
+    const resp = await saveCsv('esaj_results.csv', () =>
+      fetch('/extract/export/' + extractJobId, {
+        headers: { 'X-API-Key': key },
+      }), downloadProgress(eExportBtn));
+    if (resp && !resp.ok) {
+      setExtractStatus('error', 'Export error ' + resp.status);
+      return;
     }
-  </style>
+  } catch (err) {
+    setExtractStatus('error', 'Network error: ' + err.message);
+  } finally {
+    eExportBtn.disabled = false;
+    eExportBtn.textContent = 'Download CSV';
+  }
+});
+
+// ── Extract start / clear ────────────────────────────────────
+$.eStartBtn.addEventListener('click', startExtraction);
+
+$.eClearBtn.addEventListener('click', () => {
+  stopFollowing();
+  $.eNumbers.value = '';
+  $.eProgressWrap.classList.add('hidden');
+  $.eResultsSection.classList.add('hidden');
+  $.eExportBtn.disabled = true;
+  $.eStartBtn.disabled = false;
+  $.eStartBtn.textContent = 'Start Extraction';
+  clearExtractStatus();
+  extractJobId       = null;
+  extractResultCount = 0;
+  extractResults     = [];
+  extractSortCol     = null;
+  extractSortDir     = 'asc';
+});
+"""
+
+
+def _asset_path(content: str, ext: str) -> str:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return f"/static/app.{digest}.{ext}"
+
+
+_CSS_PATH = _asset_path(_CSS, "css")
+_JS_PATH = _asset_path(_JS, "js")
+
+# Sent as a Link header too, so a proxy in front of uvicorn can emit 103 Early Hints
+_PRELOAD_HEADER = f"<{_CSS_PATH}>; rel=preload; as=style, <{_JS_PATH}>; rel=preload; as=script"
+
+_HTML = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <link rel="preload" href="{_CSS_PATH}" as="style">
+  <link rel="preload" href="{_JS_PATH}" as="script">
+  <title>Poursuite</title>
+  <link rel="stylesheet" href="{_CSS_PATH}">
 </head>
 <body>
 
@@ -607,633 +1748,45 @@ _HTML = """<!DOCTYPE html>
         <button id="eExportBtn" class="btn btn-csv" disabled>Download CSV</button>
       </div>
       <div id="eTableWrap" class="extract-table-wrap"></div>
+      <template id="tplRow"><tr><td class="col-number"></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td><td></td></tr></template>
     </div>
 
   </div><!-- /tab-extract -->
 
 </div><!-- /container -->
 
-<script>
-  // ── Config ──────────────────────────────────────────────────
-  const PREVIEW_LEN = 400;
-
-  // ── Shared: API key ──────────────────────────────────────────
-  const keyInput = document.getElementById('apiKeyInput');
-  const stored = sessionStorage.getItem('poursuiteKey');
-  if (stored) keyInput.value = stored;
-  keyInput.addEventListener('input', () => {
-    sessionStorage.setItem('poursuiteKey', keyInput.value.trim());
-  });
-  function apiKey() { return keyInput.value.trim(); }
-
-  // ── Tab switching ────────────────────────────────────────────
-  function switchTab(name) {
-    document.querySelectorAll('.tab-btn').forEach(b => {
-      b.classList.toggle('active', b.dataset.tab === name);
-    });
-    document.querySelectorAll('.tab-content').forEach(c => {
-      c.classList.toggle('hidden', c.id !== 'tab-' + name);
-    });
-  }
-  document.querySelectorAll('.tab-btn').forEach(btn => {
-    btn.addEventListener('click', () => switchTab(btn.dataset.tab));
-  });
-
-  // ════════════════════════════════════════════════════════════
-  //  SEARCH TAB
-  // ════════════════════════════════════════════════════════════
-
-  let currentPage = 1;
-  let searching   = false;
-  let lastSearchNumbers = [];
-
-  function buildParams(page) {
-    const form = document.getElementById('searchForm');
-    const p = new URLSearchParams();
-    const names = ['keywords', 'process_number', 'start_date', 'end_date',
-                   'exclusion_terms', 'page_size'];
-    for (const n of names) {
-      const el = form.elements[n];
-      if (el && el.value.trim()) p.set(n, el.value.trim());
-    }
-    p.set('page', String(page));
-    return p;
-  }
-
-  function setStatus(type, msg) {
-    const bar = document.getElementById('statusBar');
-    bar.className = 'status ' + type;
-    bar.innerHTML = msg;
-    bar.classList.remove('hidden');
-  }
-  function clearStatus() {
-    document.getElementById('statusBar').classList.add('hidden');
-  }
-
-  async function doSearch(page) {
-    if (searching) return;
-
-    const key = apiKey();
-    if (!key) { setStatus('error', 'Please enter your API key.'); return; }
-
-    const params = buildParams(page);
-    if (!params.has('keywords') && !params.has('process_number')) {
-      setStatus('error', 'Enter keywords or a process number to search.');
-      return;
-    }
-
-    searching = true;
-    currentPage = page;
-
-    const btn = document.getElementById('searchBtn');
-    btn.disabled = true;
-    btn.innerHTML = '<span class="spinner"></span> Searching\u2026';
-    document.getElementById('csvBtn').disabled = true;
-    clearStatus();
-
-    try {
-      const resp = await fetch('/search?' + params.toString(), {
-        headers: { 'X-API-Key': key }
-      });
-
-      if (!resp.ok) {
-        let detail = resp.statusText;
-        try { detail = (await resp.json()).detail || detail; } catch (_) {}
-        setStatus('error', 'Error ' + resp.status + ': ' + detail);
-        document.getElementById('resultsSection').classList.add('hidden');
-        return;
-      }
-
-      const data = await resp.json();
-      renderResults(data, page);
-
-    } catch (err) {
-      setStatus('error', 'Network error: ' + err.message);
-    } finally {
-      searching = false;
-      btn.disabled = false;
-      btn.textContent = 'Search';
-    }
-  }
-
-  function renderResults(data, page) {
-    const section  = document.getElementById('resultsSection');
-    const list     = document.getElementById('processList');
-    const summary  = document.getElementById('resultsSummary');
-    const csvBtn   = document.getElementById('csvBtn');
-    const sendBtn  = document.getElementById('sendExtractBtn');
-
-    if (data.truncated) {
-      setStatus('warn',
-        '\u26a0\ufe0f Search timed out \u2014 results are partial. '
-        + 'Try a narrower query or a shorter date range.');
-    }
-
-    const pageSize   = parseInt(document.getElementById('fPageSize').value, 10);
-    const totalPages = Math.max(1, Math.ceil(data.total_processes / pageSize));
-
-    summary.innerHTML =
-      '<strong>' + data.total_processes.toLocaleString() + '</strong> processes found'
-      + ' \u2014 page ' + page + ' of ' + totalPages;
-
-    list.innerHTML = '';
-
-    if (!data.results || data.results.length === 0) {
-      const empty = document.createElement('div');
-      empty.className = 'empty';
-      empty.textContent = 'No results found.';
-      list.appendChild(empty);
-      csvBtn.disabled = true;
-      sendBtn.classList.add('hidden');
-      sendBtn.disabled = true;
-      section.classList.remove('hidden');
-      renderPagination(page, totalPages);
-      return;
-    }
+<script src="{_JS_PATH}"></script>
 
-    for (const proc of data.results) {
-      list.appendChild(buildProcessCard(proc));
-    }
-
-    // Store process numbers for "Send to Extract"
-    lastSearchNumbers = data.results.map(r => r.process_number);
-    sendBtn.textContent = 'Send ' + lastSearchNumbers.length + ' to Extract \u2192';
-    sendBtn.classList.remove('hidden');
-    sendBtn.disabled = false;
-
-    csvBtn.disabled = false;
-    section.classList.remove('hidden');
-    renderPagination(page, totalPages);
-  }
-
-  function buildProcessCard(proc) {
-    const card = document.createElement('div');
-    card.className = 'process-card';
-
-    const header = document.createElement('div');
-    header.className = 'process-header';
-
-    const numSpan = document.createElement('span');
-    numSpan.className = 'process-num';
-    numSpan.textContent = proc.process_number;
-
-    const right = document.createElement('div');
-    right.className = 'process-right';
-
-    const badge = document.createElement('span');
-    badge.className = 'badge';
-    badge.textContent =
-      proc.mention_count + ' mention' + (proc.mention_count !== 1 ? 's' : '');
-
-    const chevron = document.createElement('span');
-    chevron.className = 'chevron';
-    chevron.textContent = '\u25bc';
-
-    right.appendChild(badge);
-    right.appendChild(chevron);
-    header.appendChild(numSpan);
-    header.appendChild(right);
-    header.addEventListener('click', () => card.classList.toggle('open'));
-
-    const wrap = document.createElement('div');
-    wrap.className = 'mentions-wrap';
-    for (const m of proc.mentions) {
-      wrap.appendChild(buildMentionItem(m));
-    }
-
-    card.appendChild(header);
-    card.appendChild(wrap);
-    return card;
-  }
-
-  function buildMentionItem(m) {
-    const item = document.createElement('div');
-    item.className = 'mention-item';
-
-    const meta = document.createElement('div');
-    meta.className = 'mention-meta';
-
-    function metaSpan(icon, text) {
-      const s = document.createElement('span');
-      s.textContent = icon + ' ' + text;
-      return s;
-    }
-    if (m.document_date) meta.appendChild(metaSpan('📅', m.document_date));
-    if (m.db_id)         meta.appendChild(metaSpan('🗄', m.db_id));
-    if (m.file_path)     meta.appendChild(metaSpan('📄', m.file_path));
-
-    const full     = m.content || '';
-    const needsCut = full.length > PREVIEW_LEN;
-    const preview  = needsCut ? full.slice(0, PREVIEW_LEN) + '\u2026' : full;
-
-    const contentDiv = document.createElement('div');
-    contentDiv.className = 'mention-content';
-    contentDiv.textContent = preview;
-
-    item.appendChild(meta);
-    item.appendChild(contentDiv);
-
-    if (needsCut) {
-      const btn = document.createElement('button');
-      btn.className = 'expand-btn';
-      btn.textContent = 'Show more';
-      let expanded = false;
-      btn.addEventListener('click', () => {
-        expanded = !expanded;
-        contentDiv.textContent = expanded ? full : preview;
-        btn.textContent = expanded ? 'Show less' : 'Show more';
-      });
-      item.appendChild(btn);
-    }
-
-    return item;
-  }
-
-  function renderPagination(current, total) {
-    const pag = document.getElementById('pagination');
-    pag.innerHTML = '';
-    if (total <= 1) return;
-
-    function pageBtn(label, page, active, disabled) {
-      const b = document.createElement('button');
-      b.className = 'page-btn' + (active ? ' active' : '');
-      b.textContent = label;
-      b.disabled = disabled;
-      if (!disabled) b.addEventListener('click', () => doSearch(page));
-      return b;
-    }
-
-    pag.appendChild(pageBtn('\u2190 Prev', current - 1, false, current <= 1));
-
-    const start = Math.max(1, current - 2);
-    const end   = Math.min(total, start + 4);
-    for (let p = start; p <= end; p++) {
-      pag.appendChild(pageBtn(String(p), p, p === current, false));
-    }
-
-    const info = document.createElement('span');
-    info.className = 'page-info';
-    info.textContent = 'of ' + total;
-    pag.appendChild(info);
-
-    pag.appendChild(pageBtn('Next \u2192', current + 1, false, current >= total));
-  }
-
-  // ── CSV download (search) ────────────────────────────────────
-  document.getElementById('csvBtn').addEventListener('click', async () => {
-    const key = apiKey();
-    if (!key) { setStatus('error', 'API key required.'); return; }
-
-    const params = buildParams(currentPage);
-    const csvBtn = document.getElementById('csvBtn');
-
-    csvBtn.disabled = true;
-    csvBtn.innerHTML = '<span class="spinner"></span> Preparing\u2026';
-    setStatus('info', '<span class="spinner"></span> Preparing CSV\u2026');
-
-    try {
-      const resp = await fetch('/search/export?' + params.toString(), {
-        headers: { 'X-API-Key': key }
-      });
-      if (!resp.ok) {
-        setStatus('error', 'Export error ' + resp.status + ': ' + resp.statusText);
-        return;
-      }
-      const blob = await resp.blob();
-      const url  = URL.createObjectURL(blob);
-      const a    = document.createElement('a');
-      a.href     = url;
-      a.download = 'search_results.csv';
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-      URL.revokeObjectURL(url);
-      clearStatus();
-    } catch (err) {
-      setStatus('error', 'Network error: ' + err.message);
-    } finally {
-      csvBtn.disabled = false;
-      csvBtn.textContent = 'Download CSV';
-    }
-  });
-
-  // ── Send to Extract ──────────────────────────────────────────
-  document.getElementById('sendExtractBtn').addEventListener('click', () => {
-    document.getElementById('eNumbers').value = lastSearchNumbers.join('\\n');
-    switchTab('extract');
-  });
-
-  // ── Search form submit / clear ───────────────────────────────
-  document.getElementById('searchForm').addEventListener('submit', e => {
-    e.preventDefault();
-    doSearch(1);
-  });
-
-  document.getElementById('clearBtn').addEventListener('click', () => {
-    document.getElementById('searchForm').reset();
-    document.getElementById('resultsSection').classList.add('hidden');
-    document.getElementById('csvBtn').disabled = true;
-    document.getElementById('sendExtractBtn').classList.add('hidden');
-    clearStatus();
-    currentPage = 1;
-    lastSearchNumbers = [];
-  });
-
-  // ════════════════════════════════════════════════════════════
-  //  EXTRACT TAB
-  // ════════════════════════════════════════════════════════════
-
-  let extractJobId        = null;
-  let extractPollTimer    = null;
-  let extractResultCount  = 0;
-  let extractResults      = [];
-  let extractSortCol      = null;
-  let extractSortDir      = 'asc';
-
-  function setExtractStatus(type, msg) {
-    const bar = document.getElementById('eStatusBar');
-    bar.className = 'status ' + type;
-    bar.innerHTML = msg;
-    bar.classList.remove('hidden');
-  }
-  function clearExtractStatus() {
-    document.getElementById('eStatusBar').classList.add('hidden');
-  }
-
-  function parseProcessNumbers() {
-    return document.getElementById('eNumbers').value
-      .split('\\n')
-      .map(s => s.trim())
-      .filter(s => s.length > 0);
-  }
-
-  function setExtractProgress(done, total) {
-    const pct = total > 0 ? Math.round((done / total) * 100) : 0;
-    document.getElementById('eProgressFill').style.width = pct + '%';
-    document.getElementById('eProgressText').textContent =
-      'Processing ' + done + ' / ' + total + ' (' + pct + '%)';
-  }
-
-  async function startExtraction() {
-    const numbers = parseProcessNumbers();
-    if (!numbers.length) {
-      setExtractStatus('error', 'No process numbers entered.');
-      return;
-    }
-    const key = apiKey();
-    if (!key) {
-      setExtractStatus('error', 'Please enter your API key.');
-      return;
-    }
-
-    // Reset state
-    clearExtractStatus();
-    extractJobId       = null;
-    extractResultCount = 0;
-    document.getElementById('eProgressFill').style.width = '0%';
-    document.getElementById('eProgressText').textContent = 'Starting\u2026';
-    document.getElementById('eProgressWrap').classList.remove('hidden');
-    document.getElementById('eResultsSection').classList.remove('hidden');
-    document.getElementById('eResultsSummary').textContent = '';
-    document.getElementById('eTableWrap').innerHTML = '';
-    document.getElementById('eExportBtn').disabled = true;
-
-    const eStartBtn = document.getElementById('eStartBtn');
-    eStartBtn.disabled = true;
-    eStartBtn.innerHTML = '<span class="spinner"></span> Starting\u2026';
-
-    try {
-      const resp = await fetch('/extract/start', {
-        method: 'POST',
-        headers: { 'X-API-Key': key, 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          process_numbers: numbers,
-          concurrent: parseInt(document.getElementById('eConcurrent').value),
-          include_other_processes: document.getElementById('eIncludeOther').checked,
-        }),
-      });
-
-      if (!resp.ok) {
-        const err = await resp.json().catch(() => ({}));
-        setExtractStatus('error', 'Failed to start: ' + (err.detail || resp.statusText));
-        eStartBtn.disabled = false;
-        eStartBtn.textContent = 'Start Extraction';
-        return;
-      }
-
-      const { job_id } = await resp.json();
-      extractJobId = job_id;
-      setExtractProgress(0, numbers.length);
-
-      if (extractPollTimer) clearInterval(extractPollTimer);
-      extractPollTimer = setInterval(pollExtract, 2000);
-
-    } catch (err) {
-      setExtractStatus('error', 'Network error: ' + err.message);
-      eStartBtn.disabled = false;
-      eStartBtn.textContent = 'Start Extraction';
-    }
-  }
-
-  async function pollExtract() {
-    if (!extractJobId) return;
-    try {
-      const resp = await fetch('/extract/status/' + extractJobId, {
-        headers: { 'X-API-Key': apiKey() },
-      });
-      if (!resp.ok) return;
-
-      const data = await resp.json();
-      setExtractProgress(data.done, data.total);
-
-      if (data.results.length > extractResultCount) {
-        renderExtractTable(data.results);
-        extractResultCount = data.results.length;
-      }
-
-      if (data.status === 'done') {
-        finishExtraction(data.results);
-      } else if (data.status === 'error') {
-        clearInterval(extractPollTimer);
-        extractPollTimer = null;
-        document.getElementById('eStartBtn').disabled = false;
-        document.getElementById('eStartBtn').textContent = 'Start Extraction';
-        setExtractStatus('error', 'Extraction error: ' + (data.error || 'Unknown error'));
-      }
-    } catch (_) {
-      // Network blip — retry on next tick
-    }
-  }
-
-  function finishExtraction(results) {
-    clearInterval(extractPollTimer);
-    extractPollTimer = null;
-
-    const eStartBtn = document.getElementById('eStartBtn');
-    eStartBtn.disabled = false;
-    eStartBtn.textContent = 'Start Extraction';
-    document.getElementById('eExportBtn').disabled = false;
-
-    const successful = results.filter(r => !r.error).length;
-    const errors     = results.filter(r => r.error).length;
-    document.getElementById('eResultsSummary').innerHTML =
-      '<strong>' + results.length + '</strong> processed \u2014 ' +
-      '<strong>' + successful + '</strong> successful, ' +
-      '<strong>' + errors + '</strong> errors';
-    document.getElementById('eProgressText').textContent =
-      'Done. ' + results.length + ' processes extracted.';
-    document.getElementById('eProgressFill').style.width = '100%';
-  }
-
-  const EXTRACT_COLS = [
-    { key: 'number',          label: 'Process Number', cls: 'col-number' },
-    { key: 'initial_date',    label: 'Date' },
-    { key: 'class_type',      label: 'Class' },
-    { key: 'subject',         label: 'Subject' },
-    { key: 'value',           label: 'Value' },
-    { key: 'last_movement',   label: 'Last Movement' },
-    { key: 'status',          label: 'Status' },
-    { key: 'plaintiff',       label: 'Plaintiff' },
-    { key: 'defendant',       label: 'Defendant' },
-    { key: 'other_processes', label: 'Other Proc.' },
-    { key: 'error',           label: 'Error', cls: 'col-error' },
-  ];
-
-  // Parse a value cell (e.g. "R$ 1.234,56") to a number for sorting, or Infinity for empty
-  function parseSortValue(key, val) {
-    if (val === null || val === undefined || val === '') return Infinity;
-    if (key === 'other_processes') return Number(val) || 0;
-    if (key === 'value') {
-      // Strip currency symbols and convert BR decimal format to float
-      const n = parseFloat(String(val).replace(/[^\d,]/g, '').replace(',', '.'));
-      return isNaN(n) ? Infinity : n;
-    }
-    return String(val).toLowerCase();
-  }
-
-  function sortedResults() {
-    if (!extractSortCol) return extractResults;
-    return [...extractResults].sort((a, b) => {
-      const va = parseSortValue(extractSortCol, a[extractSortCol]);
-      const vb = parseSortValue(extractSortCol, b[extractSortCol]);
-      // Nulls/empty always last
-      if (va === Infinity && vb === Infinity) return 0;
-      if (va === Infinity) return 1;
-      if (vb === Infinity) return -1;
-      const cmp = va < vb ? -1 : va > vb ? 1 : 0;
-      return extractSortDir === 'asc' ? cmp : -cmp;
-    });
-  }
-
-  function renderExtractTable(results) {
-    if (results !== undefined) extractResults = results;
-
-    const table = document.createElement('table');
-    table.className = 'extract-table';
-
-    const thead = document.createElement('thead');
-    const headerRow = document.createElement('tr');
-    for (const col of EXTRACT_COLS) {
-      const th = document.createElement('th');
-      th.textContent = col.label;
-      if (extractSortCol === col.key) {
-        th.classList.add(extractSortDir === 'asc' ? 'sort-asc' : 'sort-desc');
-      }
-      th.addEventListener('click', () => {
-        if (extractSortCol === col.key) {
-          extractSortDir = extractSortDir === 'asc' ? 'desc' : 'asc';
-        } else {
-          extractSortCol = col.key;
-          extractSortDir = 'asc';
-        }
-        renderExtractTable();
-      });
-      headerRow.appendChild(th);
-    }
-    thead.appendChild(headerRow);
-    table.appendChild(thead);
-
-    const tbody = document.createElement('tbody');
-    for (const row of sortedResults()) {
-      const tr = document.createElement('tr');
-      for (const col of EXTRACT_COLS) {
-        const td = document.createElement('td');
-        const val = row[col.key];
-        td.textContent = (val !== null && val !== undefined) ? String(val) : '';
-        if (col.cls && (col.cls !== 'col-error' || val)) {
-          td.className = col.cls;
-        }
-        tr.appendChild(td);
-      }
-      tbody.appendChild(tr);
-    }
-    table.appendChild(tbody);
+</body>
+</html>"""
 
-    const wrap = document.getElementById('eTableWrap');
-    wrap.innerHTML = '';
-    wrap.appendChild(table);
-  }
+_ASSET_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
 
-  // ── Extract CSV download ─────────────────────────────────────
-  document.getElementById('eExportBtn').addEventListener('click', async () => {
-    if (!extractJobId) return;
-    const key = apiKey();
-    if (!key) return;
 
-    const eExportBtn = document.getElementById('eExportBtn');
-    eExportBtn.disabled = true;
-    eExportBtn.innerHTML = '<span class="spinner"></span> Preparing\u2026';
+class _Prebuilt:
+    """
+    ASGI app that replays a response built once at import time.
 
-    try {
-      const resp = await fetch('/extract/export/' + extractJobId, {
-        headers: { 'X-API-Key': key },
-      });
-      if (!resp.ok) {
-        setExtractStatus('error', 'Export error ' + resp.status);
-        return;
-      }
-      const blob = await resp.blob();
-      const url  = URL.createObjectURL(blob);
-      const a    = document.createElement('a');
-      a.href     = url;
-      a.download = 'esaj_results.csv';
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-      URL.revokeObjectURL(url);
-    } catch (err) {
-      setExtractStatus('error', 'Network error: ' + err.message);
-    } finally {
-      eExportBtn.disabled = false;
-      eExportBtn.textContent = 'Download CSV';
-    }
-  });
+    Only the header list is copied per request: middleware such as GZip edits
+    it in place, and a shared Response object would keep those edits.
+    """
 
-  // ── Extract start / clear ────────────────────────────────────
-  document.getElementById('eStartBtn').addEventListener('click', startExtraction);
-
-  document.getElementById('eClearBtn').addEventListener('click', () => {
-    if (extractPollTimer) { clearInterval(extractPollTimer); extractPollTimer = null; }
-    document.getElementById('eNumbers').value = '';
-    document.getElementById('eProgressWrap').classList.add('hidden');
-    document.getElementById('eResultsSection').classList.add('hidden');
-    document.getElementById('eExportBtn').disabled = true;
-    document.getElementById('eStartBtn').disabled = false;
-    document.getElementById('eStartBtn').textContent = 'Start Extraction';
-    clearExtractStatus();
-    extractJobId       = null;
-    extractResultCount = 0;
-    extractResults     = [];
-    extractSortCol     = null;
-    extractSortDir     = 'asc';
-  });
-</script>
+    def __init__(self, response: Response) -> None:
+        self._headers = response.raw_headers
+        self._body = response.body
 
-</body>
-</html>"""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": list(self._headers)})
+        await send({"type": "http.response.body", "body": self._body})
 
 
-@router.get("/", response_class=HTMLResponse)
-def serve_frontend():
-    """Serve the search + extract frontend."""
-    return _HTML
+def install_frontend(app: FastAPI) -> None:
+    """Mount the page (/) and its hashed CSS/JS assets directly on the app's router."""
+    page = HTMLResponse(_HTML, headers={"Link": _PRELOAD_HEADER, "Cache-Control": "no-cache"})
+    css = Response(_CSS, media_type="text/css", headers=_ASSET_HEADERS)
+    js = Response(_JS, media_type="text/javascript", headers=_ASSET_HEADERS)
+    app.router.routes.extend([
+        Route("/", _Prebuilt(page), methods=["GET"], include_in_schema=False),
+        Route(_CSS_PATH, _Prebuilt(css), methods=["GET"], include_in_schema=False),
+        Route(_JS_PATH, _Prebuilt(js), methods=["GET"], include_in_schema=False),
+    ])
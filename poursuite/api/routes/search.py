@@ -1,59 +1,191 @@
-import io
+import asyncio
+import base64
 import csv
-import time
-from typing import Optional
+from datetime import date
+from typing import Annotated, Optional, Tuple
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, Query, Request, Response
-from fastapi.responses import StreamingResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from poursuite.api.auth import require_api_key
-from poursuite.api.schemas import MentionResult, ProcessResult, SearchResponse
-from poursuite.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SEARCH_TIMEOUT_SECONDS
+from poursuite.api.etag import cache_headers, is_not_modified, not_modified, weak_etag
+from poursuite.api.schemas import SearchResponse
+from poursuite.config import (
+    DEFAULT_PAGE_SIZE, MAX_CONCURRENT_SEARCHES, MAX_PAGE_SIZE, MENTION_PREVIEW_LEN,
+    SEARCH_TIMEOUT_SECONDS,
+)
+from poursuite.models import Deadline, SearchPage
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+_search_slots = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+_RETRY_AFTER_SECONDS = 5
+# A queued search may wait for a slot for at most this share of its deadline,
+# so whatever gets a slot still has most of the deadline left to query with
+_SLOT_WAIT_SECONDS = SEARCH_TIMEOUT_SECONDS / 4
 
-def _build_process_results(page_result) -> list[ProcessResult]:
-    return [
-        ProcessResult(
-            process_number=pnum,
-            mention_count=len(mentions),
-            mentions=[
-                MentionResult(
-                    document_date=m.document_date,
-                    db_id=m.db_id,
-                    file_path=m.file_path,
-                    content=m.content,
-                )
-                for m in mentions
-            ],
-        )
-        for pnum, mentions in page_result.results.items()
-    ]
+# Dates are compared as strings against each database's range, so only the
+# zero-padded ISO form is accepted (date.fromisoformat alone also takes 20240131)
+_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+# Shared query-parameter types for /search and /search/export. Plain str filters
+# need no Query() at all; FastAPI reads them from the query string by default.
+_DateParam = Annotated[Optional[str], Query(pattern=_DATE_PATTERN, description="YYYY-MM-DD")]
+_PageParam = Annotated[int, Query(ge=1)]
+_PageSizeParam = Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)]
+_InvalidateCacheParam = Annotated[bool, Query(description="Bypass the cached result set")]
+
+# Header line formatted once, exactly as csv.writer would (default dialect, \r\n)
+_CSV_HEADER_BYTES = b"Process Number,Mention Count,Document Date,Database,File Path,Content\r\n"
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class _Echo:
+    """File-like sink for csv.writer: writerow returns the formatted line instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+async def _run_search(request: Request, **params) -> SearchPage:
+    """
+    Run the blocking engine.search in a worker thread, keeping the event loop free.
+
+    At most MAX_CONCURRENT_SEARCHES run at once. Time spent waiting for a slot counts
+    against the search deadline; if no slot frees up within _SLOT_WAIT_SECONDS, or
+    the deadline has already run out once one does, answer 503 with Retry-After.
+    """
+    engine = request.app.state.search_engine
+    deadline = Deadline.after(SEARCH_TIMEOUT_SECONDS)
+    try:
+        await asyncio.wait_for(_search_slots.acquire(), timeout=_SLOT_WAIT_SECONDS)
+    except TimeoutError:
+        raise _busy()
+    if deadline.expired():
+        _search_slots.release()
+        raise _busy()
+    try:
+        return await run_in_threadpool(engine.search, deadline=deadline, **params)
+    finally:
+        _search_slots.release()
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many searches in progress, try again shortly.",
+        headers={"Retry-After": str(_RETRY_AFTER_SECONDS)},
+    )
+
+
+def _search_etag(
+    request: Request, filters: tuple, page: int, page_size: int, cursor: Optional[str]
+) -> str:
+    """ETag from the normalized filters, the page window and the size of every database."""
+    db_info = request.app.state.db_manager.db_info
+    engine = request.app.state.search_engine
+    fingerprint = [(db_id, info.size_mb) for db_id, info in db_info.items()]
+    return weak_etag(engine.cache_key(*filters), page, page_size, cursor, fingerprint)
+
+
+def _check_dates(**dates: Optional[str]) -> None:
+    """422 for well-formed but impossible dates such as 2024-02-30 (the format itself is checked by Query)."""
+    for name, value in dates.items():
+        if value is None:
+            continue
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"{name} is not a valid date: {value}")
+
+
+def _encode_cursor(key: Optional[Tuple[str, str]]) -> Optional[str]:
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of _encode_cursor; 422 on anything that is not a (date, process number) pair."""
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, orjson.JSONDecodeError):
+        key = None
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(v, str) for v in key)):
+        raise HTTPException(status_code=422, detail="Invalid cursor.")
+    return key[0], key[1]
+
+
+def _mention_dict(m) -> dict:
+    truncated = len(m.content) > MENTION_PREVIEW_LEN
+    return {
+        "document_date": m.document_date,
+        "db_id": m.db_id,
+        "file_path": m.file_path,
+        "content_preview": m.content[:MENTION_PREVIEW_LEN] if truncated else m.content,
+        "content_full_url": (
+            f"/search/content/{quote(m.db_id, safe='')}/{m.row_id}" if truncated else None
+        ),
+    }
+
+
+def _search_payload(page_result: SearchPage) -> dict:
+    """Plain-dict body shaped like SearchResponse, serialized with orjson without per-mention models."""
+    return {
+        "total_processes": page_result.total_processes,
+        "page": page_result.page,
+        "page_size": page_result.page_size,
+        "truncated": page_result.truncated,
+        "next_cursor": _encode_cursor(page_result.next_key),
+        "results": [
+            {
+                "process_number": pnum,
+                "mention_count": len(mentions),
+                "mentions": [_mention_dict(m) for m in mentions],
+            }
+            for pnum, mentions in page_result.results.items()
+        ],
+    }
 
 
 @router.get("", response_model=SearchResponse)
-def search(
+async def search(
     request: Request,
-    keywords: Optional[str] = Query(default=None),
-    process_number: Optional[str] = Query(default=None),
-    start_date: Optional[str] = Query(default=None, description="YYYY-MM-DD"),
-    end_date: Optional[str] = Query(default=None, description="YYYY-MM-DD"),
-    exclusion_terms: Optional[str] = Query(default=None),
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    keywords: Optional[str] = None,
+    process_number: Optional[str] = None,
+    start_date: _DateParam = None,
+    end_date: _DateParam = None,
+    exclusion_terms: Optional[str] = None,
+    page: _PageParam = 1,
+    page_size: _PageSizeParam = DEFAULT_PAGE_SIZE,
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor of the previous page; overrides page")
+    ] = None,
+    invalidate_cache: _InvalidateCacheParam = False,
     _key: str = Depends(require_api_key),
 ):
     """
     Search across all databases. Returns paginated JSON results.
 
+    Pages can be walked by number (page) or by keyset: pass each response's
+    next_cursor back as cursor to get the following page.
+
     If the 30-second timeout is hit, results are partial and the response includes
-    X-Truncated: true header and truncated=true in the body.
+    X-Truncated: true header and truncated=true in the body. Complete results carry
+    an ETag; repeating the request with If-None-Match returns 304 without searching.
     """
-    engine = request.app.state.search_engine
-    deadline = time.time() + SEARCH_TIMEOUT_SECONDS
+    _check_dates(start_date=start_date, end_date=end_date)
+    filters = (keywords, process_number, start_date, end_date, exclusion_terms)
+    after = _decode_cursor(cursor) if cursor else None
+    etag = _search_etag(request, filters, page, min(page_size, MAX_PAGE_SIZE), cursor)
+    if not invalidate_cache and is_not_modified(request, etag):
+        return not_modified(etag)
 
-    page_result = engine.search(
+    page_result = await _run_search(
+        request,
         keywords=keywords,
         process_number=process_number,
         start_date=start_date,
@@ -61,45 +193,52 @@ def search(
         exclusion_terms=exclusion_terms,
         page=page,
         page_size=page_size,
-        deadline=deadline,
+        use_cache=not invalidate_cache,
+        after=after,
     )
 
-    response_body = SearchResponse(
-        total_processes=page_result.total_processes,
-        page=page_result.page,
-        page_size=page_result.page_size,
-        truncated=page_result.truncated,
-        results=_build_process_results(page_result),
-    )
-
-    headers = {"X-Truncated": "true"} if page_result.truncated else {}
+    headers = {"X-Truncated": "true"} if page_result.truncated else cache_headers(etag)
     return Response(
-        content=response_body.model_dump_json(),
+        content=orjson.dumps(_search_payload(page_result)),
         media_type="application/json",
         headers=headers,
     )
 
 
+@router.get("/content/{db_id}/{row_id}", response_class=PlainTextResponse)
+def mention_content(
+    request: Request,
+    db_id: str,
+    row_id: int,
+    _key: str = Depends(require_api_key),
+):
+    """Full text of a single mention; the target of content_full_url in search results."""
+    content = request.app.state.search_engine.get_content(db_id, row_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Mention not found.")
+    return PlainTextResponse(content)
+
+
 @router.get("/export")
-def export_csv(
+async def export_csv(
     request: Request,
-    keywords: Optional[str] = Query(default=None),
-    process_number: Optional[str] = Query(default=None),
-    start_date: Optional[str] = Query(default=None, description="YYYY-MM-DD"),
-    end_date: Optional[str] = Query(default=None, description="YYYY-MM-DD"),
-    exclusion_terms: Optional[str] = Query(default=None),
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    keywords: Optional[str] = None,
+    process_number: Optional[str] = None,
+    start_date: _DateParam = None,
+    end_date: _DateParam = None,
+    exclusion_terms: Optional[str] = None,
+    page: _PageParam = 1,
+    page_size: _PageSizeParam = DEFAULT_PAGE_SIZE,
+    invalidate_cache: _InvalidateCacheParam = False,
     _key: str = Depends(require_api_key),
 ):
     """
     Same as GET /search but returns results as a downloadable CSV file.
     Subject to the same 30-second timeout; X-Truncated header is set if partial.
     """
-    engine = request.app.state.search_engine
-    deadline = time.time() + SEARCH_TIMEOUT_SECONDS
-
-    page_result = engine.search(
+    _check_dates(start_date=start_date, end_date=end_date)
+    page_result = await _run_search(
+        request,
         keywords=keywords,
         process_number=process_number,
         start_date=start_date,
@@ -107,29 +246,32 @@ def export_csv(
         exclusion_terms=exclusion_terms,
         page=page,
         page_size=page_size,
-        deadline=deadline,
+        use_cache=not invalidate_cache,
     )
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        'Process Number', 'Mention Count', 'Document Date',
-        'Database', 'File Path', 'Content'
-    ])
-    for pnum, mentions in page_result.results.items():
-        for idx, m in enumerate(mentions):
-            writer.writerow([
-                pnum, f"{idx + 1}/{len(mentions)}",
-                m.document_date, m.db_id, m.file_path, m.content,
-            ])
-
-    output.seek(0)
+    writer = csv.writer(_Echo())
+
+    async def rows():
+        # Rows are batched so GZipMiddleware compresses (and the server sends)
+        # ~64 KiB blocks instead of one tiny message per mention
+        chunk = [_CSV_HEADER_BYTES]
+        size = len(_CSV_HEADER_BYTES)
+        for pnum, mentions in page_result.results.items():
+            for idx, m in enumerate(mentions):
+                line = writer.writerow([
+                    pnum, f"{idx + 1}/{len(mentions)}",
+                    m.document_date, m.db_id, m.file_path, m.content,
+                ]).encode()
+                chunk.append(line)
+                size += len(line)
+                if size >= _EXPORT_CHUNK_BYTES:
+                    yield b"".join(chunk)
+                    chunk, size = [], 0
+        if chunk:
+            yield b"".join(chunk)
+
     headers = {"Content-Disposition": "attachment; filename=search_results.csv"}
     if page_result.truncated:
         headers["X-Truncated"] = "true"
 
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers=headers,
-    )
+    return StreamingResponse(rows(), media_type="text/csv", headers=headers)
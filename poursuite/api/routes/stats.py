@@ -1,17 +1,36 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from poursuite.api.auth import require_api_key
+from poursuite.api.etag import CACHE_CONTROL, cache_headers, is_not_modified, not_modified
 from poursuite.api.schemas import StatsResponse
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+# Stats only change on restart, so a client may keep showing them while it revalidates.
+# Still private: the response sits behind the API key and must not land in shared caches.
+_STATS_CACHE_CONTROL = f"{CACHE_CONTROL}, stale-while-revalidate=300"
 
-@router.get("", response_model=StatsResponse)
+
+@router.api_route("", methods=["GET", "HEAD"], response_model=StatsResponse)
 def get_stats(
     request: Request,
     _key: str = Depends(require_api_key),
 ):
-    """Return metadata about all available databases. No COUNT(*) queries — fast."""
+    """
+    Return metadata about all available databases. No COUNT(*) queries — fast.
+    Answers 304 when If-None-Match carries the current ETag; HEAD returns only the
+    headers, so polling clients can watch the ETag without downloading the body.
+    """
     db_manager = request.app.state.db_manager
-    stats = db_manager.get_database_stats()
-    return StatsResponse(**stats)
+    # Body and ETag are fixed at startup, so a conditional request does no serializing or hashing
+    etag = db_manager.get_database_stats_etag()
+    if is_not_modified(request, etag):
+        return not_modified(etag, _STATS_CACHE_CONTROL)
+    headers = cache_headers(etag, _STATS_CACHE_CONTROL)
+    if request.method == "HEAD":
+        return Response(headers=headers, media_type="application/json")
+    return Response(
+        content=db_manager.get_database_stats_json(),
+        media_type="application/json",
+        headers=headers,
+    )
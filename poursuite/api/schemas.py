@@ -9,7 +9,9 @@ class MentionResult(BaseModel):
     document_date: str
     db_id: str
     file_path: str
-    content: str
+    content_preview: str
+    # Set only when content_preview is cut short; GET it (with the API key) for the full text
+    content_full_url: Optional[str] = None
 
 
 class ProcessResult(BaseModel):
@@ -24,6 +26,8 @@ class SearchResponse(BaseModel):
     page_size: int
     truncated: bool
     results: List[ProcessResult]
+    # Opaque keyset cursor for the next page; send back as ?cursor= (absent on the last page)
+    next_cursor: Optional[str] = None
 
 
 class StatsDatabase(BaseModel):
@@ -5,6 +5,7 @@ All input() and print() calls in the project live here.
 Scraping (eSAJ) is available as an optional post-search step.
 """
 
+import csv
 import sys
 from dataclasses import fields
 from datetime import datetime
@@ -26,6 +27,7 @@ def main() -> None:
     try:
         _search_loop(search_engine)
     finally:
+        search_engine.close()
         db_manager.close_connections()
 
 
@@ -259,8 +261,6 @@ def _display_scrape_results(results: List[ProcessData]) -> None:
 
 
 def _save_scrape_results(results: List[ProcessData]) -> None:
-    import pandas as pd
-
     if not results:
         print("No results to save.")
         return
@@ -269,11 +269,13 @@ def _save_scrape_results(results: List[ProcessData]) -> None:
         print("Results not saved.")
         return
 
-    df = pd.DataFrame([r.to_dict() for r in results])
     timestamp = datetime.now().strftime('%Y_%m_%d_%H%M%S')
     filepath = ESAJ_OUTPUT_DIR / f"eSAJ_final_{timestamp}.csv"
     ESAJ_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False, encoding='utf-8-sig')
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(ProcessData)])
+        writer.writeheader()
+        writer.writerows(r.to_dict() for r in results)
     print(f"Results saved to: {filepath}")
 
 
@@ -15,6 +15,13 @@ SCRAPER_LOG_FILE: Path = LOG_DIR / "tjsp_scraper.log"
 DEFAULT_MAX_WORKERS: int = int(os.environ.get("POURSUITE_MAX_WORKERS", "16"))
 DEFAULT_BATCH_SIZE: int = int(os.environ.get("POURSUITE_BATCH_SIZE", "50"))
 DEFAULT_MAX_BROWSERS: int = int(os.environ.get("POURSUITE_MAX_BROWSERS", "4"))
+SQLITE_MMAP_SIZE: int = int(os.environ.get("POURSUITE_SQLITE_MMAP_SIZE", str(1 << 30)))  # bytes per connection
+SQLITE_CACHE_SIZE_KB: int = int(os.environ.get("POURSUITE_SQLITE_CACHE_KB", "131072"))  # page cache per connection
+
+# --- Search result cache (full, unpaginated result sets keyed by search params) ---
+SEARCH_CACHE_SIZE: int = int(os.environ.get("POURSUITE_SEARCH_CACHE_SIZE", "64"))
+SEARCH_CACHE_TTL_SECONDS: int = int(os.environ.get("POURSUITE_SEARCH_CACHE_TTL", "60"))
+SEARCH_CACHE_MAX_MENTIONS: int = int(os.environ.get("POURSUITE_SEARCH_CACHE_MAX_MENTIONS", "200000"))  # across all entries
 
 # --- Process number regex (single definition for the entire project) ---
 PROCESS_NUMBER_PATTERN: str = r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}'
@@ -23,10 +30,16 @@ PROCESS_NUMBER_PATTERN_STRICT: str = r'^\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}$'
 # --- API settings ---
 API_KEY: str = os.environ.get("POURSUITE_API_KEY", "")
 SEARCH_TIMEOUT_SECONDS: int = int(os.environ.get("POURSUITE_SEARCH_TIMEOUT", "30"))
+MAX_CONCURRENT_SEARCHES: int = int(os.environ.get("POURSUITE_MAX_CONCURRENT_SEARCHES", "8"))
 DEFAULT_PAGE_SIZE: int = 100
 MAX_PAGE_SIZE: int = 500
+MENTION_PREVIEW_LEN: int = 400  # characters of each mention sent inline; the rest is fetched on demand
+HTTP_CACHE_MAX_AGE_SECONDS: int = int(os.environ.get("POURSUITE_HTTP_CACHE_MAX_AGE", "60"))
 
 # --- eSAJ scraper ---
 ESAJ_URL: str = "https://esaj.tjsp.jus.br/cpopg/open.do"
+ESAJ_SEARCH_URL: str = "https://esaj.tjsp.jus.br/cpopg/search.do"
+ESAJ_HTTP_TIMEOUT_SECONDS: int = int(os.environ.get("POURSUITE_ESAJ_HTTP_TIMEOUT", "20"))
+ESAJ_DRIVER_MAX_USES: int = int(os.environ.get("POURSUITE_ESAJ_DRIVER_MAX_USES", "50"))  # browser lookups per Chrome before it is recycled
 ESAJ_SEALED_ELEMENT_ID: str = "labelSituacaoProcesso"
 ESAJ_SEALED_TEXT: str = "Segredo de Justiça"
@@ -1,118 +1,225 @@
+import concurrent.futures
 import logging
 import os
+import queue
 import sqlite3
 import threading
+from contextlib import closing, contextmanager
+from hashlib import blake2b
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
 
-from poursuite.config import DB_DIR
+import orjson
+
+from poursuite.config import DB_DIR, DEFAULT_MAX_WORKERS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
 from poursuite.models import DatabaseInfo
 from poursuite.utils import setup_logging
 
 
+# The archives are only read by the app. WAL and synchronous are left alone: they
+# matter only for writers, and switching to WAL would rewrite the file header and
+# leave -wal/-shm files next to databases the maintenance scripts manage.
+_READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+    f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}",
+)
+
+
 class DatabaseManager:
     """Handles discovery and lifecycle of all SQLite database connections."""
 
     def __init__(self, db_dir: Path = DB_DIR) -> None:
         self.db_dir = db_dir
         self.logger: logging.Logger = setup_logging("search_engine")
-        self._db_cache: Dict[str, sqlite3.Connection] = {}
+        # Idle connections per database. Each search thread checks one out, so reads on
+        # the same database run in parallel instead of queueing on one connection's mutex.
+        self._db_pools: Dict[str, "queue.LifoQueue[sqlite3.Connection]"] = {}
         self._cache_lock = threading.Lock()
+        # Set by close_connections; connections checked in afterwards are closed, not pooled
+        self._closed = False
         self.db_info: Dict[str, DatabaseInfo] = self._discover_databases()
+        # db_info does not change after discovery, so the /stats payload, its JSON body
+        # and its ETag are all built once
+        self._stats_cache: Dict = self._compute_stats()
+        self._stats_json: bytes = orjson.dumps(self._stats_cache)
+        self._stats_etag: str = f'W/"{blake2b(self._stats_json, digest_size=16).hexdigest()}"'
 
     def _discover_databases(self) -> Dict[str, DatabaseInfo]:
-        """Discover and validate all database files in db_dir."""
+        """
+        Discover and validate all database files in db_dir, probing them in parallel.
+        Also sets the running aggregates total_size_mb, earliest_date and latest_date.
+        """
         databases = {}
+        self.total_size_mb: float = 0.0
+        self.earliest_date: Optional[str] = None
+        self.latest_date: Optional[str] = None
 
         if not self.db_dir.exists():
             self.logger.warning(f"Database directory {self.db_dir} not found")
             return databases
 
-        for db_path in sorted(self.db_dir.glob('*.db')):
-            try:
-                db_id = db_path.stem
+        db_paths = sorted(self.db_dir.glob('*.db'))
+        if db_paths:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(db_paths), DEFAULT_MAX_WORKERS)
+            ) as executor:
+                # map() keeps the sorted order, so db_info iterates by file name as before
+                for probed in executor.map(self._probe_one, db_paths):
+                    if not probed:
+                        continue
+                    db_id, info = probed
+                    databases[db_id] = info
+                    self.total_size_mb += info.size_mb
+                    if info.start_date and (self.earliest_date is None or info.start_date < self.earliest_date):
+                        self.earliest_date = info.start_date
+                    if info.end_date and (self.latest_date is None or info.end_date > self.latest_date):
+                        self.latest_date = info.end_date
 
-                with sqlite3.connect(str(db_path)) as conn:
-                    cursor = conn.cursor()
+        self.logger.info(f"Discovered {len(databases)} valid databases")
+        return databases
 
-                    cursor.execute("""
-                        SELECT name FROM sqlite_master
-                        WHERE type='table' AND name='paragraphs'
-                    """)
-                    if not cursor.fetchone():
-                        self.logger.warning(f"Database {db_path} missing paragraphs table, skipping")
-                        continue
+    def _probe_one(self, db_path: Path) -> Optional[Tuple[str, DatabaseInfo]]:
+        """Validate one database file and read its date range; None if it is unusable."""
+        try:
+            db_id = db_path.stem
 
-                    cursor.execute("""
-                        SELECT MIN(document_date), MAX(document_date)
-                        FROM paragraphs
-                    """)
-                    start_date, end_date = cursor.fetchone()
+            with closing(sqlite3.connect(str(db_path))) as conn:
+                cursor = conn.cursor()
 
-                    size_mb = db_path.stat().st_size / (1024 * 1024)
+                cursor.execute("""
+                    SELECT name FROM sqlite_master
+                    WHERE type='table' AND name='paragraphs'
+                """)
+                if not cursor.fetchone():
+                    self.logger.warning(f"Database {db_path} missing paragraphs table, skipping")
+                    return None
 
-                    databases[db_id] = DatabaseInfo(
-                        path=db_path,
-                        start_date=start_date,
-                        end_date=end_date,
-                        size_mb=size_mb
-                    )
+                # Separate single-aggregate queries: SQLite answers each with one seek on
+                # idx_document_date, whereas MIN and MAX together force a full scan
+                start_date = cursor.execute("SELECT MIN(document_date) FROM paragraphs").fetchone()[0]
+                end_date = cursor.execute("SELECT MAX(document_date) FROM paragraphs").fetchone()[0]
 
-                    self.logger.info(f"Found database {db_id}: {start_date} to {end_date}, {size_mb:.2f} MB")
+            size_mb = db_path.stat().st_size / (1024 * 1024)
+            self.logger.info(f"Found database {db_id}: {start_date} to {end_date}, {size_mb:.2f} MB")
 
-            except Exception as e:
-                self.logger.error(f"Error validating database {db_path}: {e}")
+            return db_id, DatabaseInfo(
+                path=db_path,
+                start_date=start_date,
+                end_date=end_date,
+                size_mb=size_mb
+            )
 
-        self.logger.info(f"Discovered {len(databases)} valid databases")
-        return databases
+        except Exception as e:
+            self.logger.error(f"Error validating database {db_path}: {e}")
+            return None
 
-    def get_connection(self, db_id: str) -> Optional[sqlite3.Connection]:
-        """Get a cached connection to a database. Thread-safe."""
-        if db_id not in self.db_info:
+    def _open_connection(self, db_id: str) -> Optional[sqlite3.Connection]:
+        try:
+            conn = sqlite3.connect(str(self.db_info[db_id].path), check_same_thread=False)
+            for pragma in _READ_PRAGMAS:
+                conn.execute(pragma)
+            return conn
+        except Exception as e:
+            self.logger.error(f"Error connecting to database {db_id}: {e}")
             return None
 
+    @contextmanager
+    def get_connection(self, db_id: str) -> Iterator[Optional[sqlite3.Connection]]:
+        """
+        Check out a pooled connection to a database for the duration of the block. Thread-safe.
+
+        Yields None if the database is unknown or cannot be opened. A new connection
+        is opened when the pool is empty; up to DEFAULT_MAX_WORKERS idle ones are kept.
+        """
+        if db_id not in self.db_info:
+            yield None
+            return
+
         with self._cache_lock:
-            if db_id not in self._db_cache:
+            pool = self._db_pools.setdefault(db_id, queue.LifoQueue(maxsize=DEFAULT_MAX_WORKERS))
+
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_connection(db_id)
+        if conn is None:
+            yield None
+            return
+
+        try:
+            yield conn
+        finally:
+            # Under the lock, so a check-in cannot slip past close_connections' drain
+            with self._cache_lock:
+                pooled = False
+                if not self._closed:
+                    try:
+                        pool.put_nowait(conn)
+                        pooled = True
+                    except queue.Full:
+                        pass
+            if not pooled:
+                conn.close()
+
+    def warm_connections(self) -> None:
+        """
+        Open one pooled connection per database and read its first row, so the first
+        search does not pay the open/PRAGMA cost. Meant to run in a background thread.
+        """
+        for db_id in self.db_info:
+            with self.get_connection(db_id) as conn:
+                if not conn:
+                    continue
                 try:
-                    path = self.db_info[db_id].path
-                    conn = sqlite3.connect(str(path), check_same_thread=False)
-                    conn.row_factory = sqlite3.Row
-                    self._db_cache[db_id] = conn
-                except Exception as e:
-                    self.logger.error(f"Error connecting to database {db_id}: {e}")
-                    return None
-            return self._db_cache[db_id]
+                    conn.execute("SELECT 1 FROM paragraphs LIMIT 1").fetchone()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Could not warm connection to {db_id}: {e}")
+        self.logger.info(f"Warmed connections for {len(self.db_info)} databases")
 
     def close_connections(self) -> None:
-        """Close all open database connections. Call only at application shutdown."""
+        """
+        Close all idle database connections and stop pooling. Call only at application
+        shutdown; connections still checked out are closed when their block exits.
+        """
         with self._cache_lock:
-            for db_id, conn in self._db_cache.items():
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            self._db_cache = {}
+            self._closed = True
+            for pool in self._db_pools.values():
+                while True:
+                    try:
+                        conn = pool.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
 
     def get_database_stats(self) -> Dict:
         """
         Return metadata about all available databases.
-        Lazy: no COUNT(*) queries — only information collected during discovery.
+        Lazy: no COUNT(*) queries — only information collected during discovery,
+        summarized once at startup. Treat the returned dict as read-only.
         """
+        return self._stats_cache
+
+    def get_database_stats_json(self) -> bytes:
+        """get_database_stats() serialized as JSON, computed once at startup."""
+        return self._stats_json
+
+    def get_database_stats_etag(self) -> str:
+        """Weak ETag of get_database_stats_json(), computed once at startup."""
+        return self._stats_etag
+
+    def _compute_stats(self) -> Dict:
         stats = {
             'total_databases': len(self.db_info),
-            'total_size_mb': sum(info.size_mb for info in self.db_info.values()),
-            'date_range': {'earliest': None, 'latest': None},
+            'total_size_mb': self.total_size_mb,
+            'date_range': {'earliest': self.earliest_date, 'latest': self.latest_date},
             'databases': {},
         }
 
-        all_start_dates = [info.start_date for info in self.db_info.values() if info.start_date]
-        all_end_dates = [info.end_date for info in self.db_info.values() if info.end_date]
-
-        if all_start_dates:
-            stats['date_range']['earliest'] = min(all_start_dates)
-        if all_end_dates:
-            stats['date_range']['latest'] = max(all_end_dates)
-
         for db_id, info in self.db_info.items():
             stats['databases'][db_id] = {
                 'size_mb': info.size_mb,
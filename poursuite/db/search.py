@@ -2,24 +2,194 @@ import concurrent.futures
 import csv
 import logging
 import re
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from poursuite.config import OUTPUT_DIR, DEFAULT_MAX_WORKERS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from poursuite.config import (
+    OUTPUT_DIR, DEFAULT_MAX_WORKERS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_MENTIONS,
+)
 from poursuite.db.connection import DatabaseManager
-from poursuite.models import SearchResult, SearchPage
+from poursuite.models import Deadline, SearchResult, SearchPage
 from poursuite.utils import setup_logging, decompress_content, sanitize_fts_query
 
 
+SortedResults = List[Tuple[str, List[SearchResult]]]
+
+# Exclusion terms: quoted phrases or whitespace-separated words
+_EXCLUSION_TOKEN_RE = re.compile(r'(?:"[^"]*"|\S+)')
+
+# Rows pulled from SQLite per fetchmany() call in the search loop
+_FETCH_BATCH = 1024
+# Row ids per "WHERE id IN (...)" when loading a page's content (below SQLite's variable limit)
+_CONTENT_BATCH = 500
+# Write buffer for CSV exports, so large exports reach the disk in few large writes
+_CSV_BUFFER_BYTES = 1 << 20
+
+
+def _process_key(item: Tuple[str, List[SearchResult]]) -> Tuple[str, str]:
+    """(most recent mention date, process number): the descending sort key, also used as the page cursor."""
+    process_number, mentions = item
+    return (mentions[0].document_date if mentions else "", process_number)
+
+
+def _content_of(mention: SearchResult) -> Optional[str]:
+    """Text of a mention, decompressing (once) the raw blob it was fetched with."""
+    if mention.content is None and mention.raw_content is not None:
+        mention.content = decompress_content(mention.raw_content)
+        mention.raw_content = None
+    return mention.content
+
+
+def _peek_content(mention: SearchResult) -> str:
+    """
+    Text of a mention without storing it: the exclusion filter reads every mention
+    of results that get cached, and only the page being served should be kept
+    decompressed. NULL content reads as "".
+    """
+    if mention.content is None and mention.raw_content is not None:
+        return decompress_content(mention.raw_content) or ""
+    return mention.content or ""
+
+
+@lru_cache(maxsize=32)
+def _search_sql(
+    has_keywords: bool,
+    has_process: bool,
+    has_start: bool,
+    has_end: bool,
+    with_content: bool,
+) -> str:
+    """SQL for one filter shape; parameters are bound in the same order by _build_search_query."""
+    conditions = []
+    cte = ""
+    source = "paragraphs p"
+
+    if has_keywords:
+        cte = """
+        WITH fts_hits AS MATERIALIZED (
+            SELECT rowid FROM paragraphs_fts WHERE paragraphs_fts MATCH ?
+        )"""
+        # CROSS JOIN pins fts_hits as the outer loop
+        source = "fts_hits f CROSS JOIN paragraphs p ON p.id = f.rowid"
+    if has_process:
+        conditions.append("p.process_number LIKE ?")
+    if has_start:
+        conditions.append("p.document_date >= ?")
+    if has_end:
+        conditions.append("p.document_date <= ?")
+
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+    return f"""{cte}
+        SELECT p.id, p.process_number, {"p.content" if with_content else "NULL"},
+               p.document_date, p.file_path
+        FROM {source}
+        WHERE {where_clause}
+        ORDER BY p.document_date DESC
+    """
+
+
+def _index_after(items: SortedResults, after: Tuple[str, str]) -> int:
+    """Index of the first item that sorts after the cursor in the descending order (binary search)."""
+    lo, hi = 0, len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _process_key(items[mid]) >= after:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class _ResultCache:
+    """
+    Thread-safe LRU of sorted search results whose entries expire after a TTL.
+
+    Besides the entry count, the cache is bounded by the total number of mentions
+    it holds (max_mentions); a result set larger than that is not cached at all.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_mentions: int) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_mentions = max_mentions
+        self._entries: "OrderedDict[tuple, Tuple[float, SortedResults, int]]" = OrderedDict()
+        self._mentions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[SortedResults]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, items, size = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._mentions -= size
+                return None
+            self._entries.move_to_end(key)
+            return items
+
+    def put(self, key: tuple, items: SortedResults) -> None:
+        if self.maxsize <= 0:
+            return
+        size = sum(len(mentions) for _, mentions in items)
+        if size > self.max_mentions:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._mentions -= previous[2]
+            self._entries[key] = (time.monotonic(), items, size)
+            self._mentions += size
+            while len(self._entries) > self.maxsize or self._mentions > self.max_mentions:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._mentions -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._mentions = 0
+
+
 class SearchEngine:
     """Handles searching across multiple databases with compression and pagination support."""
 
-    def __init__(self, db_manager: DatabaseManager) -> None:
+    def __init__(self, db_manager: DatabaseManager, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
         self.db_manager = db_manager
         self.logger: logging.Logger = setup_logging("search_engine")
+        self._cache = _ResultCache(
+            SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_MENTIONS
+        )
+        # One pool for the engine's lifetime: per-database queries from every search share
+        # these threads, so concurrent searches never spawn more than max_workers of them
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="search"
+        )
+
+    def close(self) -> None:
+        """Stop the worker threads. Call only at shutdown."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def normalize_filters(*params: Optional[str]) -> Tuple[Optional[str], ...]:
+        """Strip each filter and map empty ones to None."""
+        return tuple((value or "").strip() or None for value in params)
+
+    @staticmethod
+    def cache_key(*params: Optional[str]) -> tuple:
+        """Normalized key for a set of search filters (keywords, process number, dates, exclusions)."""
+        return SearchEngine.normalize_filters(*params)
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached result sets (e.g. after the databases were rebuilt)."""
+        self._cache.clear()
 
     def _build_search_query(
         self,
@@ -27,42 +197,38 @@ class SearchEngine:
         process_number: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        with_content: bool = True,
     ) -> Tuple[str, List]:
-        """Build SQL query based on search parameters."""
-        conditions = []
-        params = []
+        """
+        Build SQL query based on search parameters.
 
-        if keywords and keywords.strip():
-            conditions.append("""
-                id IN (
-                    SELECT rowid
-                    FROM paragraphs_fts
-                    WHERE paragraphs_fts MATCH ?
-                )
-            """)
-            params.append(sanitize_fts_query(keywords))
+        With with_content=False the content column is selected as NULL, so SQLite
+        never reads the compressed blobs; SearchEngine loads them per page instead.
 
-        if process_number and process_number.strip():
-            conditions.append("process_number LIKE ?")
-            params.append(f"%{process_number}%")
+        Keyword searches read the FTS matches first through a materialized CTE and
+        join paragraphs onto them, so the LIKE/date filters are applied to the hits
+        and can never lead the planner away from the FTS index.
 
-        if start_date and start_date.strip():
-            conditions.append("document_date >= ?")
-            params.append(start_date)
+        The SQL text depends only on which filters are present, so it comes from
+        _search_sql's cache and stays byte-identical per shape, letting each
+        connection's statement cache reuse the prepared statement.
+        """
+        has_keywords = bool(keywords and keywords.strip())
+        has_process = bool(process_number and process_number.strip())
+        has_start = bool(start_date and start_date.strip())
+        has_end = bool(end_date and end_date.strip())
 
-        if end_date and end_date.strip():
-            conditions.append("document_date <= ?")
+        params = []
+        if has_keywords:
+            params.append(sanitize_fts_query(keywords))
+        if has_process:
+            params.append(f"%{process_number}%")
+        if has_start:
+            params.append(start_date)
+        if has_end:
             params.append(end_date)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        query = f"""
-            SELECT process_number, content, document_date, file_path
-            FROM paragraphs
-            WHERE {where_clause}
-            ORDER BY document_date DESC
-        """
-
+        query = _search_sql(has_keywords, has_process, has_start, has_end, with_content)
         return query, params
 
     def _identify_relevant_databases(
@@ -91,48 +257,53 @@ class SearchEngine:
         process_number: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        deadline: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        with_content: bool = True,
     ) -> Optional[Dict[str, List[SearchResult]]]:
         """
         Search a single database.
         Returns None if skipped due to deadline, {} if searched with no results,
-        or a dict of results.
+        or a dict of results. With with_content=False every result's content is None.
         """
-        if deadline is not None and time.time() > deadline:
+        if deadline is not None and deadline.expired():
             self.logger.info(f"Skipping {db_id}: deadline exceeded")
             return None
 
         results = defaultdict(list)
-        conn = self.db_manager.get_connection(db_id)
-
-        if not conn:
-            self.logger.warning(f"Could not connect to database {db_id}")
-            return {}
-
-        try:
-            query, params = self._build_search_query(
-                keywords, process_number, start_date, end_date
-            )
-
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-
-            for row in cursor:
-                content = decompress_content(row['content'])
-                result = SearchResult(
-                    process_number=row['process_number'],
-                    content=content,
-                    document_date=row['document_date'],
-                    file_path=row['file_path'],
-                    db_id=db_id,
+        with self.db_manager.get_connection(db_id) as conn:
+            if not conn:
+                self.logger.warning(f"Could not connect to database {db_id}")
+                return {}
+
+            try:
+                query, params = self._build_search_query(
+                    keywords, process_number, start_date, end_date, with_content
                 )
-                results[row['process_number']].append(result)
 
-            return dict(results)
-
-        except Exception as e:
-            self.logger.error(f"Error searching database {db_id}: {e}")
-            return {}
+                cursor = conn.cursor()
+                cursor.arraysize = _FETCH_BATCH
+                cursor.execute(query, params)
+
+                # Plain tuples in SELECT order (see _build_search_query), fetched in batches
+                while rows := cursor.fetchmany():
+                    for row_id, pnum, content, document_date, file_path in rows:
+                        # Blobs stay compressed until read (see _content_of)
+                        compressed = isinstance(content, bytes)
+                        results[pnum].append(SearchResult(
+                            process_number=pnum,
+                            content=None if compressed else content,
+                            document_date=document_date,
+                            file_path=file_path,
+                            db_id=db_id,
+                            row_id=row_id,
+                            raw_content=content if compressed else None,
+                        ))
+
+                return dict(results)
+
+            except Exception as e:
+                self.logger.error(f"Error searching database {db_id}: {e}")
+                return {}
 
     def search(
         self,
@@ -143,12 +314,17 @@ class SearchEngine:
         exclusion_terms: Optional[str] = None,
         page: int = 1,
         page_size: int = DEFAULT_PAGE_SIZE,
-        deadline: Optional[float] = None,
-        max_workers: int = DEFAULT_MAX_WORKERS,
+        deadline: Optional[Deadline] = None,
+        use_cache: bool = True,
+        after: Optional[Tuple[str, str]] = None,
     ) -> SearchPage:
         """
         Search across all relevant databases in parallel.
 
+        The full sorted result set is cached per search parameters (see
+        SEARCH_CACHE_SIZE / SEARCH_CACHE_TTL_SECONDS), so further pages of the
+        same search are sliced from memory instead of re-querying every database.
+
         Args:
             keywords:        FTS keyword query (supports AND/OR/NOT and quoted phrases)
             process_number:  Partial or full process number to filter by
@@ -157,80 +333,173 @@ class SearchEngine:
             exclusion_terms: Space-separated terms; processes containing any term are excluded
             page:            1-based page number
             page_size:       Results per page (capped at MAX_PAGE_SIZE)
-            deadline:        Unix timestamp after which DB queries are skipped.
-                             Pass None (CLI) for no timeout; pass time.time() + N (API) for a hard cutoff.
-            max_workers:     Thread pool size
+            deadline:        Deadline after which DB queries are skipped.
+                             Pass None (CLI) for no timeout; pass Deadline.after(N) (API) for a hard cutoff.
+            use_cache:       False forces a fresh search (the result still refreshes the cache)
+            after:           Keyset cursor (SearchPage.next_key of the previous page); when given,
+                             the page starts right after that process and page is ignored
 
         Returns:
             SearchPage with paginated results and a truncated flag.
         """
         page_size = min(page_size, MAX_PAGE_SIZE)
+        # Normalized once, so the cache key and the SQL always describe the same query
+        cache_key = self.normalize_filters(
+            keywords, process_number, start_date, end_date, exclusion_terms
+        )
+        keywords, process_number, start_date, end_date, exclusion_terms = cache_key
+
+        sorted_items = self._cache.get(cache_key) if use_cache else None
+        truncated = False
+        if sorted_items is None:
+            sorted_items, truncated = self._collect_sorted(
+                keywords, process_number, start_date, end_date,
+                exclusion_terms, deadline,
+            )
+            # Partial results are not cached so the next request retries the skipped databases
+            if not truncated:
+                self._cache.put(cache_key, sorted_items)
+        else:
+            self.logger.info("Serving search results from cache")
+
+        total_processes = len(sorted_items)
+        if after is not None:
+            offset = _index_after(sorted_items, tuple(after))
+        else:
+            offset = (page - 1) * page_size
+        page_slice = sorted_items[offset: offset + page_size]
+        self._load_contents(page_slice)
+        has_more = offset + page_size < total_processes
 
+        return SearchPage(
+            results=dict(page_slice),
+            total_processes=total_processes,
+            page=page,
+            page_size=page_size,
+            truncated=truncated,
+            next_key=_process_key(page_slice[-1]) if page_slice and has_more else None,
+        )
+
+    def _collect_sorted(
+        self,
+        keywords: Optional[str],
+        process_number: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        exclusion_terms: Optional[str],
+        deadline: Optional[Deadline],
+    ) -> Tuple[SortedResults, bool]:
+        """
+        Query all relevant databases and return every matching process, newest first,
+        together with a flag telling whether any database was skipped by the deadline.
+        """
         if not self.db_manager.db_info:
             self.logger.warning("No databases found to search")
-            return SearchPage(results={}, total_processes=0, page=page, page_size=page_size)
+            return [], False
 
         relevant_dbs = self._identify_relevant_databases(start_date, end_date)
 
         if not relevant_dbs:
             self.logger.info("No relevant databases found for the specified date range")
-            return SearchPage(results={}, total_processes=0, page=page, page_size=page_size)
+            return [], False
 
         self.logger.info(f"Searching across {len(relevant_dbs)} databases")
-        all_results: Dict[str, List[SearchResult]] = defaultdict(list)
+        all_results: Dict[str, List[SearchResult]] = {}
+        # Processes found in more than one database; only their merged lists need re-sorting
+        merged: set = set()
+        get_mentions = all_results.get
         skipped_count = 0
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(len(relevant_dbs), max_workers)
-        ) as executor:
-            future_to_db = {
-                executor.submit(
-                    self._search_database,
-                    db_id, keywords, process_number, start_date, end_date, deadline
-                ): db_id
-                for db_id in relevant_dbs
-            }
-
-            for future in concurrent.futures.as_completed(future_to_db):
-                db_id = future_to_db[future]
-                try:
-                    db_results = future.result()
-                    if db_results is None:
-                        skipped_count += 1
-                    else:
-                        for proc_num, mentions in db_results.items():
-                            all_results[proc_num].extend(mentions)
-                except Exception as e:
-                    self.logger.error(f"Error processing results for database {db_id}: {e}")
+        future_to_db = {
+            self._executor.submit(
+                self._search_database,
+                db_id, keywords, process_number, start_date, end_date, deadline,
+                # The exclusion filter reads every mention; otherwise only the page is loaded
+                bool(exclusion_terms),
+            ): db_id
+            for db_id in relevant_dbs
+        }
+
+        for future in concurrent.futures.as_completed(future_to_db):
+            db_id = future_to_db[future]
+            try:
+                db_results = future.result()
+                if db_results is None:
+                    skipped_count += 1
+                else:
+                    # A database's list is adopted as-is the first time a process is seen
+                    for proc_num, mentions in db_results.items():
+                        existing = get_mentions(proc_num)
+                        if existing is None:
+                            all_results[proc_num] = mentions
+                        else:
+                            existing.extend(mentions)
+                            merged.add(proc_num)
+            except Exception as e:
+                self.logger.error(f"Error processing results for database {db_id}: {e}")
 
         truncated = skipped_count > 0
 
         # Apply exclusion filtering before pagination so total_processes is accurate
         if exclusion_terms:
-            all_results = self.filter_processes(dict(all_results), exclusion_terms)
-
-        # Sort each process's mentions by date descending
-        for mentions in all_results.values():
-            mentions.sort(key=lambda x: x.document_date, reverse=True)
+            all_results = self.filter_processes(all_results, exclusion_terms)
 
-        # Sort processes by their most-recent mention date descending
-        sorted_items = sorted(
-            all_results.items(),
-            key=lambda item: item[1][0].document_date if item[1] else "",
-            reverse=True,
-        )
+        # Sort each process's mentions by date descending. Each database returns rows
+        # ORDER BY document_date DESC, so single-database processes are already sorted.
+        for proc_num in merged:
+            mentions = all_results.get(proc_num)
+            if mentions:
+                mentions.sort(key=lambda x: x.document_date, reverse=True)
 
-        total_processes = len(sorted_items)
-        offset = (page - 1) * page_size
-        page_slice = sorted_items[offset: offset + page_size]
+        # Sort processes by their most-recent mention date descending; the process
+        # number breaks ties so the order (and keyset cursors) are deterministic
+        sorted_items = sorted(all_results.items(), key=_process_key, reverse=True)
+        return sorted_items, truncated
 
-        return SearchPage(
-            results=dict(page_slice),
-            total_processes=total_processes,
-            page=page,
-            page_size=page_size,
-            truncated=truncated,
-        )
+    def _load_contents(self, items: SortedResults) -> None:
+        """
+        Fill in the content of every mention in items: blobs fetched with the search
+        are decompressed in place, the rest are read with one primary-key lookup
+        per database (run in parallel). Loaded content
+        stays on the cached SearchResult objects, so revisiting a page costs nothing.
+        """
+        pending: Dict[str, Dict[int, List[SearchResult]]] = defaultdict(lambda: defaultdict(list))
+        for _, mentions in items:
+            for mention in mentions:
+                if _content_of(mention) is None:
+                    pending[mention.db_id][mention.row_id].append(mention)
+        if pending:
+            list(self._executor.map(self._load_db_contents, pending.items()))
+
+    def _load_db_contents(self, job: Tuple[str, Dict[int, List[SearchResult]]]) -> None:
+        db_id, by_row = job
+        row_ids = list(by_row)
+        with self.db_manager.get_connection(db_id) as conn:
+            if conn:
+                for start in range(0, len(row_ids), _CONTENT_BATCH):
+                    batch = row_ids[start: start + _CONTENT_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    for row_id, blob in conn.execute(
+                        f"SELECT id, content FROM paragraphs WHERE id IN ({placeholders})", batch
+                    ):
+                        content = decompress_content(blob) or ""
+                        for mention in by_row[row_id]:
+                            mention.content = content
+        # Rows that vanished (or an unreachable database) must not leave None behind
+        for mentions in by_row.values():
+            for mention in mentions:
+                if mention.content is None:
+                    mention.content = ""
+
+    def get_content(self, db_id: str, row_id: int) -> Optional[str]:
+        """Return the decompressed content of a single paragraph, or None if it does not exist."""
+        with self.db_manager.get_connection(db_id) as conn:
+            if not conn:
+                return None
+            row = conn.execute(
+                "SELECT content FROM paragraphs WHERE id = ?", (row_id,)
+            ).fetchone()
+        return decompress_content(row[0]) if row else None
 
     def filter_processes(
         self,
@@ -251,49 +520,49 @@ class SearchEngine:
             return results
 
         terms = []
-        for match in re.findall(r'(?:"[^"]*"|\S+)', exclusion_terms):
+        for match in _EXCLUSION_TOKEN_RE.findall(exclusion_terms):
             if match.startswith('"') and match.endswith('"'):
-                terms.append(match[1:-1].lower())
+                terms.append(match[1:-1])
             else:
-                terms.append(match.lower())
+                terms.append(match)
+
+        # One case-insensitive alternation scans each mention once for all terms,
+        # without building a lowercased copy of the content
+        pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
 
         filtered = {}
         for proc_num, mentions in results.items():
-            exclude = False
-            for mention in mentions:
-                content_lower = mention.content.lower()
-                if any(term in content_lower for term in terms):
-                    exclude = True
-                    break
-            if not exclude:
+            # any() stops at the first hit; decompressed text is discarded, not cached
+            if not any(pattern.search(_peek_content(mention)) for mention in mentions):
                 filtered[proc_num] = mentions
 
         return filtered
 
     def get_results_summary(self, results: Dict[str, List[SearchResult]]) -> Dict:
-        """Generate a summary of search results."""
-        summary = {
-            'total_processes': len(results),
-            'total_mentions': sum(len(mentions) for mentions in results.values()),
-            'date_range': {'earliest': None, 'latest': None},
-            'db_distribution': defaultdict(int),
-            'process_counts': {
-                proc_num: len(mentions)
-                for proc_num, mentions in results.items()
-            },
-        }
+        """Generate a summary of search results in a single pass over the mentions."""
+        db_distribution = defaultdict(int)
+        process_counts = {}
+        total_mentions = 0
+        earliest = latest = None
 
-        all_dates = []
-        for mentions in results.values():
+        for proc_num, mentions in results.items():
+            process_counts[proc_num] = len(mentions)
+            total_mentions += len(mentions)
             for mention in mentions:
-                all_dates.append(mention.document_date)
-                summary['db_distribution'][mention.db_id] += 1
-
-        if all_dates:
-            summary['date_range']['earliest'] = min(all_dates)
-            summary['date_range']['latest'] = max(all_dates)
-
-        return summary
+                db_distribution[mention.db_id] += 1
+                date = mention.document_date
+                if earliest is None or date < earliest:
+                    earliest = date
+                if latest is None or date > latest:
+                    latest = date
+
+        return {
+            'total_processes': len(results),
+            'total_mentions': total_mentions,
+            'date_range': {'earliest': earliest, 'latest': latest},
+            'db_distribution': db_distribution,
+            'process_counts': process_counts,
+        }
 
     def export_results_to_csv(
         self,
@@ -307,7 +576,7 @@ class SearchEngine:
         full_output_path = OUTPUT_DIR / output_path
 
         try:
-            with open(full_output_path, 'w', newline='', encoding='utf-8') as f:
+            with open(full_output_path, 'w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES) as f:
                 writer = csv.writer(f)
 
                 if include_summary:
@@ -341,16 +610,20 @@ class SearchEngine:
                     'Database', 'File Path', 'Content'
                 ])
 
-                for proc_num, mentions in results.items():
-                    for idx, result in enumerate(mentions):
-                        writer.writerow([
-                            proc_num,
-                            f"{idx + 1}/{len(mentions)}",
-                            result.document_date,
-                            result.db_id,
-                            result.file_path,
-                            result.content,
-                        ])
+                def rows():
+                    for proc_num, mentions in results.items():
+                        total = len(mentions)
+                        for idx, result in enumerate(mentions, 1):
+                            yield (
+                                proc_num,
+                                f"{idx}/{total}",
+                                result.document_date,
+                                result.db_id,
+                                result.file_path,
+                                result.content,
+                            )
+
+                writer.writerows(rows())
 
             self.logger.info(f"Results exported to {full_output_path}")
 
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, fields, asdict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Container for search results with metadata."""
     process_number: str
-    content: str
+    content: Optional[str]  # None until loaded: SearchEngine.search fills it in for the returned page
     document_date: str
     file_path: str
     db_id: str
+    row_id: Optional[int] = None
+    # Compressed content as read from SQLite, kept until something needs the text
+    raw_content: Optional[bytes] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseInfo:
     """Information about a database."""
     path: Path
@@ -24,7 +28,7 @@ class DatabaseInfo:
     size_mb: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessData:
     """Data class to store process information."""
     number: str
@@ -49,7 +53,7 @@ class ProcessData:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchPage:
     """Paginated search result container."""
     results: Dict[str, List[SearchResult]]
@@ -57,3 +61,18 @@ class SearchPage:
     page: int
     page_size: int
     truncated: bool = False
+    # Sort key of the last process on this page, if more follow; pass back as search(after=...)
+    next_key: Optional[Tuple[str, str]] = None
+
+
+@dataclass(slots=True)
+class Deadline:
+    """Point on the monotonic clock after which remaining work is skipped (immune to wall-clock jumps)."""
+    at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + seconds)
+
+    def expired(self) -> bool:
+        return time.monotonic() > self.at
@@ -13,7 +13,7 @@ class CSVProcessExtractor:
     """Extracts process numbers from CSV files generated by the search engine."""
 
     def __init__(self):
-        self.process_number_pattern = PROCESS_NUMBER_PATTERN
+        self.process_number_pattern = re.compile(PROCESS_NUMBER_PATTERN)
 
     def extract_from_csv(self, csv_path: str) -> Set[str]:
         """Extract unique process numbers from a CSV file."""
@@ -56,7 +56,7 @@ class CSVProcessExtractor:
                     row_count += 1
                     if len(row) > process_col_idx:
                         cell_value = row[process_col_idx]
-                        matches = re.findall(self.process_number_pattern, cell_value)
+                        matches = self.process_number_pattern.findall(cell_value)
                         for match in matches:
                             process_numbers.add(match)
 
@@ -74,7 +74,7 @@ class CSVProcessExtractor:
         try:
             with open(csv_path, 'r', encoding='utf-8-sig', errors='replace') as file:
                 content = file.read()
-                matches = re.findall(self.process_number_pattern, content)
+                matches = self.process_number_pattern.findall(content)
                 for match in matches:
                     process_numbers.add(match)
             logger.info(f"Fallback method found {len(process_numbers)} unique process numbers")
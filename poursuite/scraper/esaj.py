@@ -2,27 +2,57 @@ import logging
 import re
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
-from bs4 import BeautifulSoup
+import requests
+from lxml import etree, html
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from poursuite.config import (
+    ESAJ_DRIVER_MAX_USES,
+    ESAJ_HTTP_TIMEOUT_SECONDS,
     ESAJ_OUTPUT_DIR,
     ESAJ_SEALED_ELEMENT_ID,
     ESAJ_SEALED_TEXT,
+    ESAJ_SEARCH_URL,
     ESAJ_URL,
     PROCESS_NUMBER_PATTERN_STRICT,
 )
 from poursuite.models import ProcessData
 from poursuite.utils import format_currency, setup_logging
 
+_PROCESS_NUMBER_RE = re.compile(PROCESS_NUMBER_PATTERN_STRICT)
+
 logger = setup_logging("tjsp_scraper")
 
+_PARTY_CLASS = "nomeParteEAdvogado"
+
+
+def _has_class(element: html.HtmlElement, class_: str) -> bool:
+    return class_ in (element.get("class") or "").split()
+
+
+def _matches(element: html.HtmlElement, config: dict) -> bool:
+    """Same test BeautifulSoup's find(type, id=..., class_=...) applied."""
+    return (
+        element.tag == config["type"]
+        and (config.get("id") is None or element.get("id") == config["id"])
+        and (config.get("class_") is None or _has_class(element, config["class_"]))
+    )
+
+
+def _xpath_for(tag: str, id: Optional[str] = None, class_: Optional[str] = None) -> str:
+    predicates = []
+    if id:
+        predicates.append(f"@id='{id}'")
+    if class_:
+        predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {class_} ')")
+    return f"//{tag}[{' and '.join(predicates)}]"
+
 
 def _configure_chrome_options() -> webdriver.ChromeOptions:
     """Configure headless Chrome options."""
@@ -34,9 +64,120 @@ def _configure_chrome_options() -> webdriver.ChromeOptions:
     options.add_argument("--log-level=3")          # suppress INFO/WARNING/ERROR logs
     options.add_argument("--disable-logging")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    # Only text nodes are read, so images are never worth downloading
+    options.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
     return options
 
 
+# Requests the scraper never needs; stylesheets are kept because the
+# clickability waits depend on elements being laid out and visible
+_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*",
+]
+
+
+# Selenium polls every 0.5 s by default; the conditions here are cheap DOM lookups
+_POLL_SECONDS = 0.05
+
+
+def _wait(driver: webdriver.Chrome, timeout: float) -> WebDriverWait:
+    """WebDriverWait that notices the awaited element within _POLL_SECONDS of it appearing."""
+    return WebDriverWait(driver, timeout, poll_frequency=_POLL_SECONDS)
+
+
+def _new_driver(options: webdriver.ChromeOptions) -> webdriver.Chrome:
+    """Start Chrome with image, font and analytics requests blocked at the network layer."""
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+    except WebDriverException as e:
+        logger.warning(f"Could not enable request blocking: {e}")
+    return driver
+
+
+class _HttpEsajClient:
+    """Fetches eSAJ result pages with plain HTTP requests.
+
+    The results page is server-rendered, so the GET that the search form submits
+    returns everything extraction needs (the "Mais" section is present, only
+    collapsed). Each thread gets its own requests.Session, so eSAJ's session
+    cookie is never shared between concurrent searches.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _get(self, params: list) -> Optional[html.HtmlElement]:
+        """Parsed response, or None for a body lxml cannot parse (eSAJ sends empty ones when throttling)."""
+        response = self._session().get(
+            ESAJ_SEARCH_URL, params=params, timeout=ESAJ_HTTP_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        try:
+            return html.fromstring(response.content)
+        except etree.ParserError as e:
+            logger.warning(f"Unparsable eSAJ response ({len(response.content)} bytes): {e}")
+            return None
+
+    def fetch_process_page(self, process_number: str) -> Optional[html.HtmlElement]:
+        """Parsed results page, or None if eSAJ did not answer with a process page."""
+        root = self._get([
+            ("conversationId", ""),
+            ("cbPesquisa", "NUMPROC"),
+            ("numeroDigitoAnoUnificado", process_number[:15]),
+            ("foroNumeroUnificado", process_number[-4:]),
+            ("dadosConsulta.valorConsultaNuUnificado", process_number),
+            ("dadosConsulta.valorConsultaNuUnificado", "UNIFICADO"),
+            ("dadosConsulta.tipoNuProcesso", "UNIFICADO"),
+        ])
+        if root is None:
+            return None
+        if root.get_element_by_id("classeProcesso", None) is None and (
+            root.get_element_by_id(ESAJ_SEALED_ELEMENT_ID, None) is None
+        ):
+            return None
+        return root
+
+    def count_party_processes(self, party_name: str) -> Optional[int]:
+        """Total processes listed for an exact party name, or None if the page has no counter."""
+        root = self._get([
+            ("conversationId", ""),
+            ("cbPesquisa", "NMPARTE"),
+            ("dadosConsulta.valorConsulta", party_name),
+            ("chNmCompleto", "true"),
+        ])
+        counter = None if root is None else root.get_element_by_id("contadorDeProcessos", None)
+        if counter is None:
+            return None
+        try:
+            return int(counter.text_content().strip().split()[0])
+        except (IndexError, ValueError):
+            return None
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
 class ProcessValueScraper:
     """Scrapes process data from the eSAJ system (tjsp.jus.br)."""
 
@@ -49,26 +190,53 @@ class ProcessValueScraper:
         "status": {"type": "span", "id": "labelSituacaoProcesso", "class_": "unj-tag"},
     }
 
+    # One union XPath over every field, the parties and the sealed-case marker,
+    # so a results page is walked once; matches come back in document order.
+    _EXTRACTION_XPATH = etree.XPath(" | ".join(
+        [
+            _xpath_for(config["type"], config.get("id"), config.get("class_"))
+            for config in FIELD_MAPPINGS.values()
+        ]
+        + [_xpath_for("td", class_=_PARTY_CLASS), _xpath_for("span", id=ESAJ_SEALED_ELEMENT_ID)]
+    ))
+
     def __init__(self, max_concurrent_browsers: int = 4) -> None:
         self.max_concurrent_browsers = max_concurrent_browsers
         self.options = _configure_chrome_options()
         ESAJ_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         self._drivers: Dict[int, webdriver.Chrome] = {}
+        self._driver_uses: Dict[int, int] = {}
         self._driver_lock = threading.Lock()
+        self._http = _HttpEsajClient()
+        # Defendant name (normalized) -> eSAJ process count; batches repeat banks, telcos, etc.
+        self._other_processes_cache: Dict[str, int] = {}
+        # Defendants whose HTTP answer had no usable counter; they go straight to the browser
+        self._http_count_unavailable: Set[str] = set()
+        self._other_processes_lock = threading.Lock()
 
     def __del__(self) -> None:
         self._cleanup_all_drivers()
+        self._http.close()
 
     # ------------------------------------------------------------------
     # Driver lifecycle
     # ------------------------------------------------------------------
 
     def _get_driver(self) -> webdriver.Chrome:
-        """Return (or create) the Chrome instance for the current thread."""
+        """Return (or create) the Chrome instance for the current thread.
+
+        A session is recycled after ESAJ_DRIVER_MAX_USES lookups, since
+        Chromium's memory keeps growing over a long-lived session.
+        """
         tid = threading.get_ident()
+        with self._driver_lock:
+            uses = self._driver_uses.get(tid, 0)
+        if uses >= ESAJ_DRIVER_MAX_USES:
+            self._cleanup_thread_driver()
         with self._driver_lock:
             if tid not in self._drivers:
-                self._drivers[tid] = webdriver.Chrome(options=self.options)
+                self._drivers[tid] = _new_driver(self.options)
+            self._driver_uses[tid] = self._driver_uses.get(tid, 0) + 1
         return self._drivers[tid]
 
     def _cleanup_thread_driver(self) -> None:
@@ -76,6 +244,7 @@ class ProcessValueScraper:
         tid = threading.get_ident()
         with self._driver_lock:
             driver = self._drivers.pop(tid, None)
+            self._driver_uses.pop(tid, None)
         if driver:
             try:
                 driver.quit()
@@ -86,6 +255,7 @@ class ProcessValueScraper:
         with self._driver_lock:
             drivers = list(self._drivers.values())
             self._drivers.clear()
+            self._driver_uses.clear()
         for driver in drivers:
             try:
                 driver.quit()
@@ -98,7 +268,13 @@ class ProcessValueScraper:
 
     @staticmethod
     def _validate_process_number(process_number: str) -> None:
-        if not re.match(PROCESS_NUMBER_PATTERN_STRICT, process_number):
+        # Length and separator positions reject most malformed input before the regex
+        if (
+            len(process_number) != 25
+            or process_number[7] != "-"
+            or process_number[10] != "."
+            or not _PROCESS_NUMBER_RE.match(process_number)
+        ):
             raise ValueError(
                 f"Invalid process number format: {process_number}. "
                 "Expected: NNNNNNN-DD.AAAA.J.TR.OOOO"
@@ -108,22 +284,29 @@ class ProcessValueScraper:
     # Page interaction
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _open_search_form(driver: webdriver.Chrome) -> None:
+        """Reuse the process-number form if it is already on screen; load it otherwise."""
+        fields = driver.find_elements(By.ID, "numeroDigitoAnoUnificado")
+        if not (fields and fields[0].is_displayed()):
+            driver.get(ESAJ_URL)
+
     @staticmethod
     def _fill_process_form(driver: webdriver.Chrome, process_number: str) -> None:
         """Fill and submit the process search form. Waits for each element."""
-        field = WebDriverWait(driver, 10).until(
+        field = _wait(driver, 10).until(
             EC.presence_of_element_located((By.ID, "numeroDigitoAnoUnificado"))
         )
         field.clear()
         field.send_keys(process_number[:15])
 
-        field = WebDriverWait(driver, 10).until(
+        field = _wait(driver, 10).until(
             EC.presence_of_element_located((By.ID, "foroNumeroUnificado"))
         )
         field.clear()
         field.send_keys(process_number[-4:])
 
-        btn = WebDriverWait(driver, 10).until(
+        btn = _wait(driver, 10).until(
             EC.element_to_be_clickable((By.ID, "botaoConsultarProcessos"))
         )
         btn.click()
@@ -132,7 +315,7 @@ class ProcessValueScraper:
     def _wait_for_results(driver: webdriver.Chrome) -> None:
         """Wait for the results page to load after form submission."""
         try:
-            WebDriverWait(driver, 15).until(
+            _wait(driver, 15).until(
                 lambda d: d.find_elements(By.ID, "classeProcesso")
                 or d.find_elements(By.ID, ESAJ_SEALED_ELEMENT_ID)
             )
@@ -143,16 +326,32 @@ class ProcessValueScraper:
     # Data extraction
     # ------------------------------------------------------------------
 
+    def _collect_elements(self, root: html.HtmlElement) -> Dict[str, list]:
+        """Gather every element extraction needs in one tree walk, keyed by field."""
+        found: Dict[str, list] = {}
+        for element in self._EXTRACTION_XPATH(root):
+            if element.tag == "span" and element.get("id") == ESAJ_SEALED_ELEMENT_ID:
+                found.setdefault("sealed", []).append(element)
+            elif element.tag == "td" and _has_class(element, _PARTY_CLASS):
+                found.setdefault("parties", []).append(element)
+            for field, config in self.FIELD_MAPPINGS.items():
+                if _matches(element, config):
+                    found.setdefault(field, []).append(element)
+        return found
+
     @staticmethod
-    def _is_sealed_case(soup: BeautifulSoup) -> bool:
-        element = soup.find("span", id=ESAJ_SEALED_ELEMENT_ID)
-        return element is not None and ESAJ_SEALED_TEXT.lower() in element.text.lower()
+    def _is_sealed_case(found: Dict[str, list]) -> bool:
+        return any(
+            ESAJ_SEALED_TEXT.lower() in element.text_content().lower()
+            for element in found.get("sealed", ())[:1]
+        )
 
-    def _extract_field(self, soup: BeautifulSoup, config: dict) -> Optional[str]:
-        element = soup.find(config["type"], id=config.get("id"), class_=config.get("class_"))
-        if not element:
+    @staticmethod
+    def _extract_field(found: Dict[str, list], field: str, config: dict) -> Optional[str]:
+        elements = found.get(field)
+        if not elements:
             return None
-        value = element.text.strip()
+        value = elements[0].text_content().strip()
         if config.get("id") == "valorAcaoProcesso":
             return format_currency(value)
         if "slice" in config:
@@ -160,25 +359,26 @@ class ProcessValueScraper:
         return value
 
     @staticmethod
-    def _extract_parties(soup: BeautifulSoup):
-        parties = soup.find_all("td", class_="nomeParteEAdvogado")
+    def _extract_parties(found: Dict[str, list]):
+        parties = found.get("parties", ())
         if len(parties) < 2:
             return None, None
         return (
-            parties[0].text.strip().partition("\n")[0],
-            parties[1].text.strip().partition("\n")[0],
+            parties[0].text_content().strip().partition("\n")[0],
+            parties[1].text_content().strip().partition("\n")[0],
         )
 
-    def _extract_process_data(self, soup: BeautifulSoup, process_number: str) -> ProcessData:
+    def _extract_process_data(self, root: html.HtmlElement, process_number: str) -> ProcessData:
+        found = self._collect_elements(root)
         # Check for sealed case before attempting field extraction
-        if self._is_sealed_case(soup):
+        if self._is_sealed_case(found):
             return ProcessData(number=process_number, error="Segredo de justiça")
         try:
             data = {
-                field: self._extract_field(soup, config)
+                field: self._extract_field(found, field, config)
                 for field, config in self.FIELD_MAPPINGS.items()
             }
-            plaintiff, defendant = self._extract_parties(soup)
+            plaintiff, defendant = self._extract_parties(found)
             return ProcessData(
                 number=process_number,
                 initial_date=data["initial_date"],
@@ -202,83 +402,138 @@ class ProcessValueScraper:
     def get_process_data(
         self, process_number: str, include_other_processes: bool = True
     ) -> ProcessData:
-        """Scrape data for a single process number."""
+        """Scrape data for a single process number.
+
+        Pages are fetched over plain HTTP; a browser is only started when eSAJ
+        answers with something other than a process page.
+        """
         try:
             self._validate_process_number(process_number)
-            driver = self._get_driver()
-
-            driver.get(ESAJ_URL)
-            self._fill_process_form(driver, process_number)
-            self._wait_for_results(driver)
-
-            try:
-                mais = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.LINK_TEXT, "Mais"))
-                )
-                driver.execute_script("arguments[0].click();", mais)
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.ID, "dataHoraDistribuicaoProcesso"))
-                    )
-                except TimeoutException:
-                    pass
-            except TimeoutException:
-                pass
 
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            process_data = self._extract_process_data(soup, process_number)
+            root = self._fetch_over_http(process_number)
+            if root is None:
+                root = self._fetch_with_browser(process_number)
+            process_data = self._extract_process_data(root, process_number)
 
             if include_other_processes and process_data.defendant and not process_data.error:
-                process_data.other_processes = self._get_other_processes_count(
-                    driver, process_data.defendant
+                process_data.other_processes = self._count_other_processes(
+                    process_data.defendant
                 )
 
             return process_data
 
+        except WebDriverException as e:
+            # The session may be wedged; let the next process start a fresh browser
+            self._cleanup_thread_driver()
+            return ProcessData(number=process_number, error=str(e))
         except Exception as e:
             return ProcessData(number=process_number, error=str(e))
 
+    def _fetch_over_http(self, process_number: str) -> Optional[html.HtmlElement]:
+        try:
+            return self._http.fetch_process_page(process_number)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {process_number}, using browser: {e}")
+            return None
+
+    def _fetch_with_browser(self, process_number: str) -> html.HtmlElement:
+        driver = self._get_driver()
+
+        self._open_search_form(driver)
+        current_page = driver.find_element(By.TAG_NAME, "html")
+        self._fill_process_form(driver, process_number)
+        try:
+            # The previous results page may still be on screen; never read it
+            _wait(driver, 15).until(EC.staleness_of(current_page))
+        except TimeoutException:
+            pass
+        self._wait_for_results(driver)
+
+        try:
+            mais = _wait(driver, 5).until(
+                EC.element_to_be_clickable((By.LINK_TEXT, "Mais"))
+            )
+            driver.execute_script("arguments[0].click();", mais)
+            try:
+                _wait(driver, 5).until(
+                    EC.presence_of_element_located((By.ID, "dataHoraDistribuicaoProcesso"))
+                )
+            except TimeoutException:
+                pass
+        except TimeoutException:
+            pass
+
+        return html.fromstring(driver.page_source)
+
+    def _count_other_processes(self, defendant_name: str) -> Optional[int]:
+        """Other-process count for a defendant; None (not cached) when both lookups fail."""
+        key = " ".join(defendant_name.split()).upper()
+        with self._other_processes_lock:
+            cached = self._other_processes_cache.get(key)
+            skip_http = key in self._http_count_unavailable
+        if cached is not None:
+            return cached
+
+        count = None
+        if not skip_http:
+            try:
+                count = self._http.count_party_processes(defendant_name)
+                if count is None:
+                    with self._other_processes_lock:
+                        self._http_count_unavailable.add(key)
+            except requests.RequestException as e:
+                # Transient; the next row for this defendant tries HTTP again
+                logger.warning(f"HTTP party search failed, using browser: {e}")
+        if count is None:
+            count = self._get_other_processes_count(self._get_driver(), defendant_name)
+        if count is not None:
+            with self._other_processes_lock:
+                self._other_processes_cache[key] = count
+        return count
+
     def _get_other_processes_count(
         self, driver: webdriver.Chrome, defendant_name: str
     ) -> Optional[int]:
-        """Search eSAJ by defendant name and return total process count."""
+        """Search eSAJ by defendant name and return total process count, or None if unknown."""
         try:
             driver.get(ESAJ_URL)
 
-            select = WebDriverWait(driver, 5).until(
+            select = _wait(driver, 5).until(
                 EC.presence_of_element_located((By.ID, "cbPesquisa"))
             )
             select.send_keys("NMPARTE")
 
-            checkbox = WebDriverWait(driver, 5).until(
+            checkbox = _wait(driver, 5).until(
                 EC.presence_of_element_located((By.ID, "pesquisarPorNomeCompleto"))
             )
             driver.execute_script("arguments[0].click();", checkbox)
 
-            name_field = WebDriverWait(driver, 5).until(
+            name_field = _wait(driver, 5).until(
                 EC.presence_of_element_located((By.ID, "campo_NMPARTE"))
             )
             name_field.clear()
             name_field.send_keys(defendant_name)
 
-            btn = WebDriverWait(driver, 5).until(
+            btn = _wait(driver, 5).until(
                 EC.element_to_be_clickable((By.ID, "botaoConsultarProcessos"))
             )
             btn.click()
 
             try:
-                count_el = WebDriverWait(driver, 5).until(
+                count_el = _wait(driver, 5).until(
                     EC.presence_of_element_located((By.ID, "contadorDeProcessos"))
                 )
                 return int(count_el.text.strip().split()[0])
             except TimeoutException:
-                return 0
+                logger.warning(f"No process counter for {defendant_name!r}")
+                return None
             except (IndexError, ValueError):
-                return 0
+                logger.warning(f"Unreadable process counter for {defendant_name!r}")
+                return None
 
         except Exception as e:
             logger.error(f"Error getting process count: {e}")
-            return 0
+            return None
         finally:
             driver.delete_all_cookies()
 
@@ -296,34 +551,41 @@ class ProcessValueScraper:
 
         Results are delivered to progress_callback in completion order as they
         arrive. The return value restores the original input order.
+
+        Each worker thread keeps its Chrome session for the whole batch instead
+        of launching a browser per process; all sessions are quit at the end.
         """
         total = len(process_numbers)
         logger.info(
             f"Processing {total} processes with {self.max_concurrent_browsers} concurrent browsers"
         )
 
-        results: List[ProcessData] = []
+        # Each result is written straight into its input slot
+        results: List[Optional[ProcessData]] = [None] * total
+        done = 0
 
         def scrape_one(pn: str) -> ProcessData:
             try:
                 return self.get_process_data(pn, include_other_processes=include_other_processes)
             except Exception as e:
                 return ProcessData(number=pn, error=f"Worker error: {e}")
-            finally:
-                self._cleanup_thread_driver()
-
-        with ThreadPoolExecutor(max_workers=self.max_concurrent_browsers) as executor:
-            futures = {executor.submit(scrape_one, pn): pn for pn in process_numbers}
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                logger.info(f"Progress: {len(results)}/{total} — {result.number}")
-                if progress_callback:
-                    progress_callback(result)
-
-        # Restore original input order
-        pn_to_result = {r.number: r for r in results}
-        return [
-            pn_to_result.get(pn, ProcessData(number=pn, error="No result returned"))
-            for pn in process_numbers
-        ]
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_concurrent_browsers, thread_name_prefix="esaj"
+            ) as executor:
+                futures = {
+                    executor.submit(scrape_one, pn): idx
+                    for idx, pn in enumerate(process_numbers)
+                }
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[futures[future]] = result
+                    done += 1
+                    logger.info(f"Progress: {done}/{total} — {result.number}")
+                    if progress_callback:
+                        progress_callback(result)
+        finally:
+            self._cleanup_all_drivers()
+
+        return results
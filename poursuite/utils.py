@@ -1,6 +1,9 @@
+import atexit
 import logging
+import queue
 import re
 import zlib
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
@@ -12,6 +15,8 @@ def setup_logging(name: str, log_file: Optional[Path] = None) -> logging.Logger:
     Configure and return a named logger with file + console handlers.
     If log_file is None, defaults to LOG_DIR / f"{name}.log".
     Guard against duplicate handlers so multiple imports don't stack them.
+    Records are handed to a background QueueListener, so logging never blocks
+    the calling thread on file or console writes.
     """
     logger = logging.getLogger(name)
     if logger.handlers:
@@ -26,11 +31,16 @@ def setup_logging(name: str, log_file: Optional[Path] = None) -> logging.Logger:
 
     fh = logging.FileHandler(str(log_file))
     fh.setFormatter(fmt)
-    logger.addHandler(fh)
 
     ch = logging.StreamHandler()
     ch.setFormatter(fmt)
-    logger.addHandler(ch)
+
+    # Worker threads only enqueue records; one listener thread does the file/console I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, fh, ch)
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger
 
@@ -40,29 +50,38 @@ def decompress_content(content) -> str:
     Decompress zlib-compressed content bytes; pass through plain strings unchanged.
     """
     if isinstance(content, bytes):
-        try:
-            return zlib.decompress(content).decode('utf-8')
-        except zlib.error:
-            return content.decode('utf-8', errors='replace')
+        if _has_zlib_header(content):
+            try:
+                return zlib.decompress(content).decode('utf-8')
+            except zlib.error:
+                pass
+        return content.decode('utf-8', errors='replace')
     return content
 
 
+def _has_zlib_header(content: bytes) -> bool:
+    """RFC 1950 header check: deflate method and a CMF/FLG pair divisible by 31."""
+    return len(content) >= 2 and content[0] & 0x0F == 8 and ((content[0] << 8) | content[1]) % 31 == 0
+
+
 def format_currency(value: str) -> Optional[str]:
     """
     Format a currency string to ensure a single space after 'R$'.
     """
     if not value:
         return None
-    value = re.sub(r'\s+', '', value)
+    value = ''.join(value.split())
     if value.startswith('R$'):
         value = 'R$ ' + value[2:]
     return value
 
 
 # Characters that are genuinely dangerous in FTS5 (cause syntax errors) but are NOT
-# part of valid query syntax. Parentheses, AND/OR/NOT, quotes, and * are valid FTS5
-# syntax and must NOT be escaped.
-_FTS_UNSAFE = re.compile(r'([\\^])')
+# part of valid query syntax (backslash and caret). Parentheses, AND/OR/NOT, quotes,
+# and * are valid FTS5 syntax and must NOT be escaped.
+_FTS_OPERATORS = frozenset(('AND', 'OR', 'NOT'))
+# One FTS token: runs of non-space characters, with quoted phrases kept whole
+_FTS_TOKEN_RE = re.compile(r'(?:"[^"]*"|\S)+')
 
 
 def sanitize_fts_query(query: str) -> str:
@@ -79,13 +98,16 @@ def sanitize_fts_query(query: str) -> str:
       - Backslash
       - Caret
     """
-    tokens = re.findall(r'(?:"[^"]*"|\S)+', query)
     sanitized = []
-    for token in tokens:
-        if token.upper() in ('AND', 'OR', 'NOT'):
-            sanitized.append(token.upper())
-        elif token.startswith('"') and token.endswith('"'):
+    for token in _FTS_TOKEN_RE.findall(query):
+        upper = token.upper()
+        if upper in _FTS_OPERATORS:
+            sanitized.append(upper)
+        elif token[0] == '"' and token[-1] == '"':
             sanitized.append(token)
+        elif '\\' in token or '^' in token:
+            # Backslash first, so the escapes added for carets are not doubled
+            sanitized.append(token.replace('\\', '\\\\').replace('^', '\\^'))
         else:
-            sanitized.append(_FTS_UNSAFE.sub(r'\\\1', token))
+            sanitized.append(token)
     return ' '.join(sanitized)
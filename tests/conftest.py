@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import tempfile
+import zlib
+
+# Keep log files and output out of the Windows default paths in poursuite.config
+_SCRATCH = tempfile.mkdtemp(prefix="poursuite-tests-")
+os.environ.setdefault("POURSUITE_LOG_DIR", os.path.join(_SCRATCH, "logs"))
+os.environ.setdefault("POURSUITE_OUTPUT_DIR", os.path.join(_SCRATCH, "out"))
+os.environ.setdefault("POURSUITE_ESAJ_OUTPUT_DIR", os.path.join(_SCRATCH, "esaj"))
+
+import pytest  # noqa: E402
+
+
+def _create_db(path, rows):
+    """Archive with the production schema; rows are (process_number, text, document_date)."""
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE paragraphs (id INTEGER PRIMARY KEY AUTOINCREMENT, process_number TEXT, "
+        "content BLOB, file_path TEXT, document_date DATE)"
+    )
+    conn.execute("CREATE VIRTUAL TABLE paragraphs_fts USING fts5(content, content_rowid=id)")
+    conn.execute("CREATE INDEX idx_document_date ON paragraphs(document_date)")
+    for i, (process_number, text, document_date) in enumerate(rows):
+        cursor = conn.execute(
+            "INSERT INTO paragraphs (process_number, content, file_path, document_date) "
+            "VALUES (?, ?, ?, ?)",
+            (process_number, zlib.compress(text.encode()), f"f{i}.pdf", document_date),
+        )
+        conn.execute(
+            "INSERT INTO paragraphs_fts (rowid, content) VALUES (?, ?)", (cursor.lastrowid, text)
+        )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db_dir(tmp_path):
+    _create_db(tmp_path / "2023.db", [
+        ("0000001-12.2023.8.26.0100", "penhora de conta", "2023-03-01"),
+        ("0000002-12.2023.8.26.0100", "penhora SISBAJUD", "2023-05-01"),
+        ("0000003-12.2023.8.26.0100", "citacao do banco", "2023-07-01"),
+    ])
+    return tmp_path
+
+
+@pytest.fixture
+def db_manager(db_dir):
+    from poursuite.db.connection import DatabaseManager
+
+    manager = DatabaseManager(db_dir)
+    yield manager
+    manager.close_connections()
+
+
+@pytest.fixture
+def engine(db_manager):
+    from poursuite.db.search import SearchEngine
+
+    search_engine = SearchEngine(db_manager)
+    yield search_engine
+    search_engine.close()
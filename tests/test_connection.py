@@ -0,0 +1,27 @@
+import sqlite3
+
+import pytest
+
+
+def test_connection_checked_in_after_close_is_closed(db_manager):
+    with db_manager.get_connection("2023") as idle:
+        pass
+    with db_manager.get_connection("2023") as busy:
+        with db_manager.get_connection("2023") as other:
+            pass
+        db_manager.close_connections()
+        # Still usable by its holder until the block exits
+        busy.execute("SELECT 1").fetchone()
+
+    for conn in (idle, busy, other):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert all(pool.empty() for pool in db_manager._db_pools.values())
+
+
+def test_connections_are_reused_while_open(db_manager):
+    with db_manager.get_connection("2023") as first:
+        pass
+    with db_manager.get_connection("2023") as second:
+        pass
+    assert first is second
@@ -0,0 +1,101 @@
+from lxml import html
+
+from poursuite.scraper.esaj import ProcessValueScraper
+
+PROCESS_NUMBER = "0000001-12.2023.8.26.0100"
+
+_PAGE = """<html><body>
+<span id="classeProcesso">Procedimento Comum</span>
+<span id="labelSituacaoProcesso" class="unj-tag">Em andamento</span>
+<td class="nomeParteEAdvogado">Fulano</td><td class="nomeParteEAdvogado">Banco S/A</td>
+</body></html>"""
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return _Response(self.content)
+
+
+def _scraper(monkeypatch, body: bytes):
+    scraper = ProcessValueScraper(max_concurrent_browsers=1)
+    session = _Session(body)
+    monkeypatch.setattr(scraper._http, "_session", lambda: session)
+    return scraper, session
+
+
+def test_empty_http_body_falls_back_to_browser(monkeypatch):
+    scraper, session = _scraper(monkeypatch, b"")
+    browser_fetches = []
+
+    def fetch_with_browser(process_number):
+        browser_fetches.append(process_number)
+        return html.fromstring(_PAGE)
+
+    monkeypatch.setattr(scraper, "_fetch_with_browser", fetch_with_browser)
+
+    result = scraper.get_process_data(PROCESS_NUMBER, include_other_processes=False)
+
+    assert session.calls == 1
+    assert browser_fetches == [PROCESS_NUMBER]
+    assert result.error is None
+    assert result.class_type == "Procedimento Comum"
+    assert result.defendant == "Banco S/A"
+
+
+def test_whitespace_http_body_reads_as_no_count(monkeypatch):
+    scraper, _ = _scraper(monkeypatch, b"  \n ")
+    assert scraper._http.count_party_processes("Banco S/A") is None
+
+
+def test_other_processes_counted_once_per_defendant(monkeypatch):
+    # The party search answers with a page that has no process counter
+    scraper, session = _scraper(monkeypatch, _PAGE.encode())
+    browser_counts = []
+
+    def count_with_browser(driver, defendant_name):
+        browser_counts.append(defendant_name)
+        return 7
+
+    monkeypatch.setattr(scraper, "_get_driver", lambda: None)
+    monkeypatch.setattr(scraper, "_get_other_processes_count", count_with_browser)
+
+    first = scraper.get_process_data(PROCESS_NUMBER, include_other_processes=True)
+    second = scraper.get_process_data(
+        "0000002-12.2023.8.26.0100", include_other_processes=True
+    )
+
+    assert first.other_processes == second.other_processes == 7
+    assert browser_counts == ["Banco S/A"]
+    # Two process pages plus a single party search
+    assert session.calls == 3
+
+
+def test_failed_browser_count_is_retried_without_http(monkeypatch):
+    scraper, session = _scraper(monkeypatch, _PAGE.encode())
+    browser_counts = []
+
+    def count_with_browser(driver, defendant_name):
+        browser_counts.append(defendant_name)
+        return None
+
+    monkeypatch.setattr(scraper, "_get_driver", lambda: None)
+    monkeypatch.setattr(scraper, "_get_other_processes_count", count_with_browser)
+
+    assert scraper._count_other_processes("Banco S/A") is None
+    assert scraper._count_other_processes(" banco  s/a ") is None
+
+    assert len(browser_counts) == 2
+    assert session.calls == 1
@@ -0,0 +1,15 @@
+def test_padded_filter_matches_cold_and_warm_cache(engine):
+    cold = engine.search(process_number="0000001 ", deadline=None)
+    assert list(cold.results) == ["0000001-12.2023.8.26.0100"]
+
+    warm = engine.search(process_number="0000001 ", deadline=None)
+    assert list(warm.results) == list(cold.results)
+
+    # The unpadded spelling is the same query, so it shares the cache entry
+    assert list(engine.search(process_number="0000001", deadline=None).results) == list(cold.results)
+    assert len(engine._cache._entries) == 1
+
+
+def test_blank_filters_are_treated_as_absent(engine):
+    page = engine.search(keywords="  ", process_number="", deadline=None)
+    assert page.total_processes == 3
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from poursuite.api.routes import search as search_routes
+from poursuite.models import Deadline
+
+
+class _Engine:
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, **params):
+        self.calls += 1
+        return "page"
+
+
+def _request(engine):
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(search_engine=engine)))
+
+
+def test_full_semaphore_answers_503(monkeypatch):
+    monkeypatch.setattr(search_routes, "_search_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(search_routes, "_SLOT_WAIT_SECONDS", 0.01)
+    engine = _Engine()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(search_routes._run_search(_request(engine), keywords="x"))
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == str(search_routes._RETRY_AFTER_SECONDS)
+    assert engine.calls == 0
+
+
+def test_expired_deadline_after_slot_answers_503_and_frees_slot(monkeypatch):
+    slots = asyncio.Semaphore(1)
+    monkeypatch.setattr(search_routes, "_search_slots", slots)
+    monkeypatch.setattr(Deadline, "expired", lambda self: True)
+    engine = _Engine()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(search_routes._run_search(_request(engine), keywords="x"))
+
+    assert exc.value.status_code == 503
+    assert engine.calls == 0
+    assert not slots.locked()
+
+
+def test_free_slot_runs_search(monkeypatch):
+    monkeypatch.setattr(search_routes, "_search_slots", asyncio.Semaphore(1))
+    engine = _Engine()
+
+    assert asyncio.run(search_routes._run_search(_request(engine), keywords="x")) == "page"
+    assert engine.calls == 1
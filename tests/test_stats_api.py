@@ -0,0 +1,34 @@
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from poursuite.api.auth import require_api_key
+from poursuite.api.routes import stats as stats_routes
+
+
+def _client(db_manager):
+    app = FastAPI()
+    app.include_router(stats_routes.router)
+    app.dependency_overrides[require_api_key] = lambda: "test"
+    app.state.db_manager = db_manager
+    return TestClient(app)
+
+
+def test_stats_served_from_startup_body_and_etag(db_manager, monkeypatch):
+    # Nothing is serialized or hashed per request
+    monkeypatch.setattr(orjson, "dumps", None)
+    client = _client(db_manager)
+
+    response = client.get("/stats")
+    assert response.status_code == 200
+    assert response.headers["etag"] == db_manager.get_database_stats_etag()
+    assert response.json() == db_manager.get_database_stats()
+    assert response.json()["total_databases"] == 1
+
+    etag = response.headers["etag"]
+    assert client.get("/stats", headers={"If-None-Match": etag}).status_code == 304
+
+    head = client.head("/stats")
+    assert head.status_code == 200
+    assert head.headers["etag"] == etag
+    assert head.content == b""